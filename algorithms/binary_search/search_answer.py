@@ -0,0 +1,59 @@
+# Parallel Binary Search on the Answer (k-ary search)
+# Same contract as the template in binary_search.py: the predicate is monotonic over
+# [lo, hi] (False...False True...True) and the minimum value satisfying it is returned.
+#
+# When the predicate is expensive, each round evaluates `probes` evenly spaced points
+# at once on a process pool instead of one midpoint, which shrinks the range by a factor
+# of probes+1 per round: log_{k+1}(range) rounds instead of log2(range).
+# Results are memoized, so no point is evaluated twice, even across calls sharing a cache.
+# With vectorized=True the predicate is called once per round with the list of probes
+# and must return the list of results, e.g. a NumPy implementation, and no pool is used.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+
+def search_answer(lo, hi, predicate, probes=None, vectorized=False, executor=None, cache=None):
+    # predicate must be picklable (a module-level function or a partial of one)
+    # unless vectorized=True or a thread-based executor is passed in
+    probes = probes or os.cpu_count()
+    cache = {} if cache is None else cache
+    own_executor = executor is None and not vectorized
+    if own_executor:
+        executor = ProcessPoolExecutor(probes)
+    try:
+        while lo < hi:
+            points = sorted({lo + (hi-lo) * i // (probes+1) for i in range(1, probes+1)})
+            pending = [p for p in points if p not in cache]
+            if pending:
+                results = predicate(pending) if vectorized else executor.map(predicate, pending)
+                cache.update(zip(pending, results))
+
+            # The smallest True probe bounds the answer from above and the largest
+            # False probe below it bounds it from below
+            for p in points:
+                if cache[p]:
+                    hi = p
+                    break
+                lo = p + 1
+        return lo
+    finally:
+        if own_executor:
+            executor.shutdown()
+
+
+# LeetCode - 1011. Capacity To Ship Packages Within D Days
+# https://leetcode.com/problems/capacity-to-ship-packages-within-d-days/
+def can_ship(weights, days, capacity):
+    cap, days_needed = capacity, 1
+    for w in weights:
+        if cap < w:
+            cap, days_needed = capacity, days_needed+1
+        cap -= w
+    return days_needed <= days
+
+
+class Solution:
+    def shipWithinDays(self, weights: list[int], days: int) -> int:
+        return search_answer(max(weights), sum(weights), partial(can_ship, weights, days))
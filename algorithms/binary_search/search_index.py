@@ -0,0 +1,143 @@
+# Batch lookups against a static sorted array.
+# All functions return insertion points with the semantics of the template in
+# binary_search.py: side='left' is the minimum index with array[i] >= target
+# (bisect.bisect_left), side='right' the minimum index with array[i] > target
+# (bisect.bisect_right). Every query runs in the same vectorized pass.
+
+import numpy as np
+
+
+def search_many(sorted_array, queries, side='left'):
+    return np.searchsorted(np.asarray(sorted_array), np.asarray(queries), side=side)
+
+
+def _bounded_search(array, queries, lo, hi, side):
+    # The binary search template, run over all queries at once, each within its own [lo, hi]
+    while True:
+        active = lo < hi
+        if not active.any():
+            return lo
+        mid = lo + (hi - lo) // 2
+        values = array[np.minimum(mid, len(array)-1)]
+        go_left = (values >= queries) if side == 'left' else (values > queries)
+        hi = np.where(active & go_left, mid, hi)
+        lo = np.where(active & ~go_left, mid + 1, lo)
+
+
+# Eytzinger Layout
+# Readings:
+# Array Layouts for Comparison-Based Searching (Khuong, Morin) - https://arxiv.org/abs/1509.05053
+#
+# The array is stored in BFS order of the implicit binary search tree: node k has its
+# children at 2k and 2k+1. The first levels of the tree share a handful of cache lines
+# and the next node to visit is computed without a branch, so the descent is
+# k = 2k + (node < target) for every level, then the trailing 1 bits are dropped.
+class EytzingerIndex:
+    def __init__(self, sorted_array):
+        array = np.asarray(sorted_array)
+        self.n = n = len(array)
+        self.levels = n.bit_length()
+
+        # Subtree sizes bottom-up, then the in-order rank of every node top-down
+        size = np.zeros(2 * (1 << self.levels) + 2, dtype=np.int64)
+        for d in range(self.levels-1, -1, -1):
+            ks = np.arange(1 << d, min(1 << (d+1), n+1))
+            size[ks] = 1 + size[2*ks] + size[2*ks+1]
+        rank = np.zeros(1 << self.levels, dtype=np.int64)
+        if n:
+            rank[1] = size[2]
+        for d in range(self.levels-1):
+            ks = np.arange(1 << d, min(1 << (d+1), n+1))
+            left, right = 2*ks, 2*ks+1
+            rank[left] = rank[ks] - size[2*left+1] - 1
+            rank[right] = rank[ks] + size[2*right] + 1
+
+        # rank[k] maps a tree node back to its sorted index; 0 maps to n, i.e. "past the end"
+        rank[0] = n
+        self.rank = rank[:n+1]
+        self.tree = np.empty(n+1, dtype=array.dtype)
+        self.tree[1:] = array[self.rank[1:]]
+
+    def search_many(self, queries, side='left'):
+        queries = np.asarray(queries)
+        k = np.ones(len(queries), dtype=np.int64)
+        for _ in range(self.levels):
+            inside = k <= self.n
+            nodes = self.tree[np.where(inside, k, 0)]
+            go_right = (nodes < queries) if side == 'left' else (nodes <= queries)
+            k = np.where(inside, 2*k + go_right, k)
+        # Drop the trailing 1 bits (right turns) and the last left turn
+        lowbit = ~k & (k + 1)
+        k >>= np.frexp(lowbit.astype(np.float64))[1].astype(np.int64)
+        return self.rank[k]
+
+
+# Piecewise Linear ("learned") Index
+# Readings:
+# The Case for Learned Index Structures (Kraska et al.) - https://arxiv.org/abs/1712.01208
+#
+# The sorted array is split into segments of fixed size, each modelled by the line through
+# its first and last key. The largest prediction error of each segment is recorded at
+# build time, so a lookup is: find the segment among the few segment keys, predict the
+# position, then binary search only the window of +/- error around the prediction.
+class PiecewiseLinearIndex:
+    def __init__(self, sorted_array, segment_size=256):
+        self.array = array = np.asarray(sorted_array)
+        n = len(array)
+        self.starts = np.arange(0, n, segment_size)
+        self.stops = np.minimum(self.starts + segment_size, n)
+        self.first_keys = array[self.starts]
+        first = self.first_keys.astype(np.float64)
+        last = array[self.stops - 1].astype(np.float64)
+        span = np.where(last > first, last - first, 1)
+        self.slopes = (self.stops - 1 - self.starts) / span
+
+        positions = np.arange(n)
+        segments = positions // segment_size
+        predicted = self._predict(array, segments)
+        errors = np.zeros(len(self.starts), dtype=np.int64)
+        np.maximum.at(errors, segments, np.abs(predicted - positions))
+        self.errors = errors
+
+    def _predict(self, keys, segments):
+        offsets = (keys.astype(np.float64) - self.first_keys[segments]) * self.slopes[segments]
+        return self.starts[segments] + np.round(offsets).astype(np.int64)
+
+    def search_many(self, queries, side='left'):
+        # The segment is the last one whose first key is < target (<= for side='right'),
+        # so the answer is in (start, stop]. Since the model is monotonic, the answer is
+        # also within -error/+error+1 of the prediction, the window the search runs on.
+        queries = np.asarray(queries)
+        if len(self.array) == 0:
+            return np.zeros(len(queries), dtype=np.int64)
+        segments = np.searchsorted(self.first_keys, queries, side=side) - 1
+        before = segments < 0
+        segments = np.maximum(segments, 0)
+        predicted, errors = self._predict(queries, segments), self.errors[segments]
+        hi = np.minimum(predicted + errors + 1, self.stops[segments])
+        lo = np.minimum(np.maximum(predicted - errors, self.starts[segments] + 1), hi)
+        lo, hi = np.where(before, 0, lo), np.where(before, 0, hi)
+        return _bounded_search(self.array, queries, lo, hi, side)
+
+
+if __name__ == "__main__":
+    import bisect
+    from time import perf_counter
+
+    rng = np.random.default_rng(0)
+    array = np.sort(rng.integers(0, 10**12, 10**7))
+    queries = rng.integers(0, 10**12, 10**6)
+
+    start = perf_counter()
+    expected = [bisect.bisect_left(array, q) for q in queries[:10**5].tolist()]
+    print(f"bisect_left loop (1e5 queries): {perf_counter() - start:.2f}s")
+
+    for name, search in (
+        ('search_many', lambda q: search_many(array, q)),
+        ('EytzingerIndex', EytzingerIndex(array).search_many),
+        ('PiecewiseLinearIndex', PiecewiseLinearIndex(array).search_many),
+    ):
+        start = perf_counter()
+        result = search(queries)
+        print(f"{name} (1e6 queries): {perf_counter() - start:.2f}s")
+        assert result[:10**5].tolist() == expected
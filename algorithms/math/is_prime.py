@@ -1,13 +1,99 @@
 import math
+import random
+from functools import lru_cache
 
+SMALL_PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+# Testing against every base in SMALL_PRIMES, i.e. the first 13 primes, is deterministic
+# below this bound (> 2**64)
+DETERMINISTIC_LIMIT = 3_317_044_064_679_887_385_961_981
 
-def is_prime(number: int) -> bool:
-    if number <= 1:
+
+def is_prime(number: int, rounds: int = 16) -> bool:
+    # Miller-Rabin: deterministic for 64-bit ints, probabilistic with `rounds` extra
+    # random bases beyond that (error probability <= 4**-rounds)
+    if number < 2:
         return False
-    if number == 2:
-        return True
+    for p in SMALL_PRIMES:
+        if number % p == 0:
+            return number == p
+
+    d, s = number - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
 
-    for i in range(2, int(math.sqrt(number))+1):
-        if number % i == 0:
+    def is_witness(a):
+        x = pow(a, d, number)
+        if x == 1 or x == number - 1:
             return False
-    return True
+        for _ in range(s - 1):
+            x = x * x % number
+            if x == number - 1:
+                return False
+        return True
+
+    if any(is_witness(a) for a in SMALL_PRIMES):
+        return False
+    if number < DETERMINISTIC_LIMIT:
+        return True
+    return not any(is_witness(random.randrange(2, number - 1)) for _ in range(rounds))
+
+
+@lru_cache(maxsize=1 << 16)
+def is_prime_cached(number: int) -> bool:
+    return is_prime(number)
+
+
+def is_prime_many(numbers) -> list[bool]:
+    # Cheap checks first: small numbers and multiples of small primes never reach
+    # Miller-Rabin, and repeated queries are answered by the LRU cache
+    results = []
+    for number in numbers:
+        if number < 2:
+            results.append(False)
+        elif number <= SMALL_PRIMES[-1] or any(number % p == 0 for p in SMALL_PRIMES):
+            results.append(number in SMALL_PRIMES)
+        else:
+            results.append(is_prime_cached(number))
+    return results
+
+
+def primes_upto(limit: int) -> list[int]:
+    # Sieve of Eratosthenes over a bytearray, [2, limit]
+    if limit < 2:
+        return []
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0] = sieve[1] = 0
+    for i in range(2, math.isqrt(limit) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytes(len(range(i*i, limit + 1, i)))
+    return [i for i, flag in enumerate(sieve) if flag]
+
+
+def prime_segments(lo: int, hi: int, segment_size: int = 1 << 20):
+    # Segmented sieve over [lo, hi): only the base primes up to sqrt(hi) and one
+    # segment are in memory at a time. Yields the primes of each segment as a list.
+    base_primes = primes_upto(math.isqrt(max(hi - 1, 0)))
+    lo = max(lo, 2)
+    for start in range(lo, hi, segment_size):
+        end = min(start + segment_size, hi)
+        sieve = bytearray([1]) * (end - start)
+        for p in base_primes:
+            if p * p >= end:
+                break
+            first = max(p * p, (start + p - 1) // p * p)
+            sieve[first-start::p] = bytes(len(range(first, end, p)))
+        yield [start + i for i, flag in enumerate(sieve) if flag]
+
+
+def primes_in_range(lo: int, hi: int, segment_size: int = 1 << 20):
+    # Streams the primes in [lo, hi)
+    for segment in prime_segments(lo, hi, segment_size):
+        yield from segment
+
+
+if __name__ == "__main__":
+    # Strong pseudoprime to every prime base up to 37, caught by base 41
+    assert not is_prime(318_665_857_834_031_151_167_461)
+    assert is_prime(2**61 - 1) and not is_prime(3_317_044_064_679_887_385_961_981)
+    assert primes_upto(100) == [p for p in range(101) if is_prime(p)]
@@ -0,0 +1,143 @@
+# Boruvka's Algorithm over a process pool
+# Time Complexity: O(ElogV) work, O(logV) rounds, each round split across the workers
+#
+# Every round, each component picks its cheapest outgoing edge and all those edges join
+# the MST at once, so the number of components at least halves per round.
+# The edge arrays and the component labels live in shared memory: every worker scans its
+# own shard of the edges and returns the cheapest edge per component it saw, which the
+# parent merges and applies to the union-find over the shared label array.
+#
+# Ties are broken by (weight, edge index), which makes the MST unique, so the result is
+# exactly the one Kruskal's algorithm gives with a stable sort by weight (kruskal_mst).
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import os
+
+import numpy as np
+
+_shared = {}
+
+
+def _to_shared(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm
+
+
+def _attach(specs):
+    for name, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def _cheapest(lo, hi):
+    u, v, w, comp = (_shared[name][1] for name in ('u', 'v', 'w', 'comp'))
+    cu, cv = comp[u[lo:hi]], comp[v[lo:hi]]
+    cross = np.flatnonzero(cu != cv)
+    idx = cross + lo
+    return _cheapest_per_component(
+        np.concatenate([cu[cross], cv[cross]]),
+        np.concatenate([idx, idx]),
+        w,
+    )
+
+
+def _cheapest_per_component(comps, idx, w):
+    order = np.lexsort((idx, w[idx], comps))
+    comps, idx = comps[order], idx[order]
+    first = np.ones(len(comps), dtype=bool)
+    first[1:] = comps[1:] != comps[:-1]
+    return comps[first], idx[first]
+
+
+def boruvka_mst(n, u, v, w, workers=None, shards=None):
+    # u, v, w: edge arrays. Returns (cost, MST edge indices sorted by (weight, index)).
+    # Disconnected graphs produce a minimum spanning forest.
+    u = np.ascontiguousarray(u, dtype=np.int64)
+    v = np.ascontiguousarray(v, dtype=np.int64)
+    w = np.ascontiguousarray(w)
+    workers = workers or os.cpu_count()
+    shards = shards or workers
+    bounds = np.linspace(0, len(u), shards + 1, dtype=np.int64)
+
+    arrays = {'u': u, 'v': v, 'w': w, 'comp': np.arange(n, dtype=np.int64)}
+    blocks = {name: _to_shared(arr) for name, arr in arrays.items()}
+    specs = {name: (blocks[name].name, arr.shape, arr.dtype) for name, arr in arrays.items()}
+    comp = np.ndarray((n,), dtype=np.int64, buffer=blocks['comp'].buf)
+    mst = []
+    try:
+        with ProcessPoolExecutor(workers, initializer=_attach, initargs=(specs,)) as pool:
+            while True:
+                results = list(pool.map(_cheapest, bounds[:-1], bounds[1:]))
+                comps, idx = _cheapest_per_component(
+                    np.concatenate([r[0] for r in results]),
+                    np.concatenate([r[1] for r in results]),
+                    w,
+                )
+                if len(comps) == 0:
+                    break
+                mst.append(np.unique(idx))
+
+                # Hook every component onto the one its cheapest edge leads to.
+                # With consistent tie-breaking the only cycles are mutual pairs,
+                # where the smaller label stays the root.
+                other = np.where(comp[u[idx]] == comps, comp[v[idx]], comp[u[idx]])
+                parent = np.arange(n, dtype=np.int64)
+                parent[comps] = other
+                mutual = (parent[other] == comps) & (comps < other)
+                parent[comps[mutual]] = comps[mutual]
+                while True:
+                    nxt = parent[parent]
+                    if np.array_equal(nxt, parent):
+                        break
+                    parent = nxt
+                comp[:] = parent[comp]
+    finally:
+        del comp
+        for shm in blocks.values():
+            shm.close()
+            shm.unlink()
+
+    edges = np.concatenate(mst) if mst else np.empty(0, dtype=np.int64)
+    edges = edges[np.lexsort((edges, w[edges]))]
+    return w[edges].sum(), edges
+
+
+def kruskal_mst(n, u, v, w):
+    # Single-process reference with the same (weight, index) tie-breaking
+    root = list(range(n))
+
+    def find(x):
+        while root[x] != x:
+            root[x] = root[root[x]]
+            x = root[x]
+        return x
+
+    edges = []
+    for i in np.argsort(w, kind='stable').tolist():
+        ru, rv = find(int(u[i])), find(int(v[i]))
+        if ru != rv:
+            root[rv] = ru
+            edges.append(i)
+    edges = np.array(edges, dtype=np.int64)
+    return w[edges].sum(), edges
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    rng = np.random.default_rng(0)
+    n, m = 10**6, 10**7
+    u, v = rng.integers(0, n, m), rng.integers(0, n, m)
+    w = rng.integers(0, 10**6, m)
+
+    start = perf_counter()
+    cost, edges = boruvka_mst(n, u, v, w)
+    print(f"boruvka_mst: {perf_counter() - start:.2f}s")
+
+    start = perf_counter()
+    expected_cost, expected_edges = kruskal_mst(n, u, v, w)
+    print(f"kruskal_mst: {perf_counter() - start:.2f}s")
+
+    assert cost == expected_cost and np.array_equal(edges, expected_edges)
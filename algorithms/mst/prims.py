@@ -4,6 +4,8 @@
 
 from heapq import heappop, heappush
 
+import numpy as np
+
 
 # Prim's Algorithm with Heap
 class Solution:
@@ -52,3 +54,72 @@ class Solution:
                 )
 
         return int(ans)
+
+
+# Prim's Algorithm with NumPy (dense graph)
+# Time Complexity: O(n^2) with every step being a handful of vectorized passes
+# The key array holds the distance of every point to the tree. Adding a point costs
+# one vectorized distance computation against it and one np.minimum over the keys.
+# metric: 'l1', 'l2' or a callable f(points, point) -> distances of all points to point.
+METRICS = {
+    'l1': lambda pts, p: np.abs(pts - p).sum(axis=1),
+    'l2': lambda pts, p: np.sqrt(((pts - p) ** 2).sum(axis=1)),
+}
+
+
+def prims_dense(points, metric='l1'):
+    # Returns the MST as (cost, [(parent, child, weight)])
+    pts = np.asarray(points, dtype=np.float64)
+    n = len(pts)
+    dist = METRICS[metric] if isinstance(metric, str) else metric
+    key = np.full(n, np.inf)
+    parent = np.full(n, -1, dtype=np.int64)
+    in_tree = np.zeros(n, dtype=bool)
+
+    edges, cost = [], 0
+    cur = 0
+    for _ in range(n):
+        in_tree[cur] = True
+        if parent[cur] != -1:
+            edges.append((int(parent[cur]), cur, key[cur].item()))
+            cost += key[cur].item()
+        d = dist(pts, pts[cur])
+        closer = ~in_tree & (d < key)
+        key[closer] = d[closer]
+        parent[closer] = cur
+        key[cur] = np.inf
+        cur = int(np.argmin(np.where(in_tree, np.inf, key)))
+    return cost, edges
+
+
+class Solution:
+    def minCostConnectPoints(self, points: list[list[int]]) -> int:
+        return int(prims_dense(points, 'l1')[0])
+
+
+# Prim's Algorithm with Heap (sparse graph in CSR form)
+# Time Complexity: O(ElogE)
+# The neighbours of node u are indices[indptr[u]:indptr[u+1]], with the matching weights.
+# Disconnected graphs produce a minimum spanning forest.
+# Returns the MST edges as [(u, v, weight)], in the order they were added.
+def prims_csr(indptr, indices, weights):
+    n = len(indptr) - 1
+    in_tree = [False] * n
+    edges = []
+
+    for start in range(n):
+        if in_tree[start]:
+            continue
+        heap = [(0, start, -1)]
+        while heap:
+            w, u, parent = heappop(heap)
+            if in_tree[u]:
+                continue
+            in_tree[u] = True
+            if parent != -1:
+                edges.append((parent, u, w))
+            for k in range(indptr[u], indptr[u+1]):
+                v = indices[k]
+                if not in_tree[v]:
+                    heappush(heap, (weights[k], v, u))
+    return edges
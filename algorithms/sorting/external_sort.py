@@ -0,0 +1,137 @@
+# External Merge Sort
+# Time Complexity: O(nlogn) comparisons, 1 + ceil(log_F(runs)) passes over the data on disk,
+# with F = max_fan_in (two passes unless there are more than F runs)
+#
+# Sorts more records than fit in memory:
+# 1. Run generation: records are read in chunks that fit the memory budget, each chunk is
+#    sorted and spilled to a temp file as packed fixed-size binary records (struct format).
+#    With workers > 0, chunks are sorted and written by a process pool in parallel, with at
+#    most `workers` chunks in flight and the memory budget split between them.
+# 2. K-way merge: at most max_fan_in runs are open at once, so the number of open files
+#    stays bounded however large the input is. While there are more runs than that,
+#    consecutive groups of max_fan_in runs are merged into intermediate runs. The final
+#    runs are read back with buffered block reads and heapq.merge picks the next smallest
+#    record. The merge is stable and lazy, so the sorted output is a generator that
+#    downstream stages can consume while the merge is still running.
+
+import heapq
+import os
+import struct
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+
+
+def _pack(record_struct, record):
+    return record_struct.pack(*record) if isinstance(record, tuple) else record_struct.pack(record)
+
+
+def _write_run(records, record_format, key, tmp_dir):
+    record_struct = struct.Struct(record_format)
+    records.sort(key=key)
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    with os.fdopen(fd, 'wb', buffering=1 << 20) as f:
+        for record in records:
+            f.write(_pack(record_struct, record))
+    return path
+
+
+def _merge_runs(paths, record_format, key, buffer_size, tmp_dir):
+    record_struct = struct.Struct(record_format)
+    runs = [_read_run(path, record_format, buffer_size) for path in paths]
+    fd, path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+    try:
+        with os.fdopen(fd, 'wb', buffering=1 << 20) as f:
+            for record in heapq.merge(*runs, key=key):
+                f.write(_pack(record_struct, record))
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+def _read_run(path, record_format, buffer_size):
+    record_struct = struct.Struct(record_format)
+    block_size = max(buffer_size // record_struct.size, 1) * record_struct.size
+    # Single-field records are yielded as plain values rather than 1-tuples
+    single = len(record_struct.unpack(bytes(record_struct.size))) == 1
+    with open(path, 'rb', buffering=0) as f:
+        while block := f.read(block_size):
+            if single:
+                yield from (record[0] for record in record_struct.iter_unpack(block))
+            else:
+                yield from record_struct.iter_unpack(block)
+
+
+def read_records(path, record_format, buffer_size=1 << 20):
+    # Streams the records of a binary file of packed fixed-size records
+    yield from _read_run(path, record_format, buffer_size)
+
+
+def external_sort(records, record_format='<q', key=None, memory_budget=64 << 20,
+                  workers=0, tmp_dir=None, max_fan_in=256):
+    # records: any iterable of values (single-field format) or tuples matching record_format
+    # Yields the records in sorted order. Temp runs are removed once the generator is done.
+    # key must be picklable (i.e. not a lambda) when workers > 0.
+    record_struct = struct.Struct(record_format)
+    # Python objects take several times their packed size, hence the safety factor
+    # and with workers, the chunks being sorted plus the one being read share the budget
+    chunk_len = max(memory_budget // (record_struct.size * 8 * (workers + 1)), 1)
+
+    records = iter(records)
+    paths = {}  # chunk number -> run path, merged in chunk order so the sort stays stable
+    pending = {}  # future -> chunk number
+    pool = ProcessPoolExecutor(workers) if workers else None
+
+    def collect(futures):
+        for future in futures:
+            paths[pending.pop(future)] = future.result()
+
+    try:
+        number = 0
+        while chunk := list(islice(records, chunk_len)):
+            if pool:
+                if len(pending) >= workers:
+                    collect(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[pool.submit(_write_run, chunk, record_format, key, tmp_dir)] = number
+            else:
+                paths[number] = _write_run(chunk, record_format, key, tmp_dir)
+            number += 1
+        if pool:
+            collect(wait(pending).done)
+            pool.shutdown()
+
+        buffer_size = max(memory_budget // max_fan_in, 1 << 12)
+        while len(paths) > max_fan_in:
+            # Group g of the previous pass becomes run g, whose number was freed by group g // F
+            runs = [paths[number] for number in sorted(paths)]
+            for group, start in enumerate(range(0, len(runs), max_fan_in)):
+                merged = _merge_runs(runs[start:start + max_fan_in], record_format, key,
+                                     buffer_size, tmp_dir)
+                for number in range(start, min(start + max_fan_in, len(runs))):
+                    os.remove(paths.pop(number))
+                paths[group] = merged
+
+        runs = [_read_run(paths[number], record_format, buffer_size) for number in sorted(paths)]
+        yield from heapq.merge(*runs, key=key)
+    finally:
+        if pool:
+            # Waits for the running chunks, so that the runs they wrote are removed too
+            pool.shutdown(cancel_futures=True)
+            for future, number in pending.items():
+                if not future.cancelled() and future.exception() is None:
+                    paths[number] = future.result()
+        for path in paths.values():
+            os.remove(path)
+
+
+def sort_file(src, dst, record_format='<q', key=None, memory_budget=64 << 20, workers=0,
+              max_fan_in=256):
+    # Sorts a binary file of packed fixed-size records into dst
+    record_struct = struct.Struct(record_format)
+    with open(dst, 'wb', buffering=1 << 20) as f:
+        records = read_records(src, record_format)
+        for record in external_sort(records, record_format, key, memory_budget, workers,
+                                    tmp_dir=os.path.dirname(os.path.abspath(dst)),
+                                    max_fan_in=max_fan_in):
+            f.write(_pack(record_struct, record))
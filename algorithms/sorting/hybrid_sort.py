@@ -0,0 +1,154 @@
+# LeetCode - 912. Sort an Array
+# https://leetcode.com/problems/sort-an-array/description/
+
+# Hybrid Sort (introsort with three-way partitioning)
+# Time Complexity: Best Case: O(n), Average Case: O(nlogn), Worst Case: O(nlogn)
+#
+# The strategy is picked per input:
+# - int arrays go through counting sort when the value range is small, NumPy otherwise
+# - inputs that are already sorted or reversed are detected in one O(n) pass
+# - otherwise introsort: a three-way (Dutch national flag) partition with a median-of-3
+#   pivot, so duplicates collapse into the middle band instead of degrading it,
+#   insertion sort for short ranges, and a heapsort fallback once the recursion
+#   depth exceeds 2*log2(n), which bounds the worst case.
+
+from heapq import heapify, heappop
+from math import log2
+
+import numpy as np
+
+INSERTION_SORT_THRESHOLD = 16
+COUNTING_SORT_MAX_RANGE = 1 << 16
+
+
+def insertion_sort(nums, start, end):
+    for i in range(start+1, end+1):
+        num, j = nums[i], i-1
+        while j >= start and nums[j] > num:
+            nums[j+1] = nums[j]
+            j -= 1
+        nums[j+1] = num
+
+
+def heap_sort(nums, start, end):
+    heap = nums[start:end+1]
+    heapify(heap)
+    for i in range(start, end+1):
+        nums[i] = heappop(heap)
+
+
+def counting_sort(nums, min_, max_):
+    cnter = [0] * (max_-min_+1)
+    for num in nums:
+        cnter[num-min_] += 1
+    i = 0
+    for offset, cnt in enumerate(cnter):
+        nums[i:i+cnt] = [min_+offset] * cnt
+        i += cnt
+
+
+def partition3(nums, start, end):
+    # Returns (lt, gt): nums[start:lt] < pivot, nums[lt:gt+1] == pivot, nums[gt+1:end+1] > pivot
+    mid = start + (end-start)//2
+    pivot = sorted((nums[start], nums[mid], nums[end]))[1]
+    lt, i, gt = start, start, end
+    while i <= gt:
+        if nums[i] < pivot:
+            nums[lt], nums[i] = nums[i], nums[lt]
+            lt += 1
+            i += 1
+        elif nums[i] > pivot:
+            nums[gt], nums[i] = nums[i], nums[gt]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+
+def intro_sort(nums):
+    # Iterative, with the smaller side pushed last so the stack stays O(logn)
+    stack = [(0, len(nums)-1, 2*int(log2(len(nums) or 1)))]
+    while stack:
+        start, end, depth = stack.pop()
+        if end-start < INSERTION_SORT_THRESHOLD:
+            insertion_sort(nums, start, end)
+        elif depth == 0:
+            heap_sort(nums, start, end)
+        else:
+            lt, gt = partition3(nums, start, end)
+            parts = sorted(((start, lt-1), (gt+1, end)), key=lambda p: p[0]-p[1])
+            for lo, hi in parts:
+                stack.append((lo, hi, depth-1))
+
+
+def hybrid_sort(nums):
+    # Sorts nums in place and returns it
+    n = len(nums)
+    if n < 2:
+        return nums
+
+    ascending = descending = True
+    for i in range(1, n):
+        if nums[i-1] > nums[i]:
+            ascending = False
+        elif nums[i-1] < nums[i]:
+            descending = False
+        if not (ascending or descending):
+            break
+    if ascending:
+        return nums
+    if descending:
+        nums.reverse()
+        return nums
+
+    if all(type(num) is int for num in nums):
+        min_, max_ = min(nums), max(nums)
+        if max_-min_ <= max(COUNTING_SORT_MAX_RANGE, n):
+            counting_sort(nums, min_, max_)
+            return nums
+        if -(1 << 63) <= min_ and max_ < (1 << 63):
+            nums[:] = np.sort(np.array(nums, dtype=np.int64)).tolist()
+            return nums
+
+    intro_sort(nums)
+    return nums
+
+
+class Solution:
+    def sortArray(self, nums: list[int]) -> list[int]:
+        return hybrid_sort(nums)
+
+
+if __name__ == "__main__":
+    import random
+    from time import perf_counter
+
+    def adversarial(n):
+        # Organ pipe: ascending then descending, every value twice, bad for median-of-3
+        half = [i*2 for i in range(n//2)]
+        return half + half[::-1]
+
+    n = 10**5
+    inputs = {
+        'random': lambda: [random.randint(-10**9, 10**9) for _ in range(n)],
+        'sorted': lambda: list(range(n)),
+        'reversed': lambda: list(range(n, 0, -1)),
+        'few unique': lambda: [random.randint(0, 3) for _ in range(n)],
+        'adversarial': lambda: adversarial(n),
+        'random floats': lambda: [random.random() for _ in range(n)],
+    }
+    sorts = {
+        'hybrid_sort': hybrid_sort,
+        'intro_sort': lambda nums: intro_sort(nums) or nums,
+        'sorted': sorted,
+    }
+    for input_name, make in inputs.items():
+        nums = make()
+        timings = []
+        for sort_name, sort in sorts.items():
+            data = nums[:]
+            start = perf_counter()
+            result = sort(data)
+            timings.append(f"{sort_name} {perf_counter() - start:.3f}s")
+            assert result == sorted(nums)
+        print(f"{input_name:>13}: " + ", ".join(timings))
@@ -0,0 +1,187 @@
+# Order Statistics: selection with a linear worst case, multi-k selection and
+# streaming quantile sketches.
+#
+# select(): introselect. Random-pivot quick select runs until it has touched 4n items,
+# then the remaining range switches to median of medians, whose pivot always discards at
+# least 30% of the items. Time Complexity: Average Case: O(n), Worst Case: O(n)
+# multi_select(): several order statistics with one partition per level; each side only
+# recurses with the ranks that fall into it. Time Complexity: O(nlogk)
+# KLLSketch: approximate quantiles over an unbounded stream in O(k log(n/k)) memory.
+# Unlike quick_select.py, none of these mutate the input.
+
+from math import ceil
+from random import choice, random
+
+
+def partition3(nums, pivot):
+    lows = [x for x in nums if x < pivot]
+    pivots = [x for x in nums if x == pivot]
+    highs = [x for x in nums if x > pivot]
+    return lows, pivots, highs
+
+
+def median_of_medians(nums):
+    medians = [sorted(nums[i:i+5])[(len(nums[i:i+5])-1)//2] for i in range(0, len(nums), 5)]
+    return mom_select(medians, (len(medians)-1)//2)
+
+
+def mom_select(nums, k):
+    # Deterministic linear time selection of the k-th smallest (0-based)
+    while True:
+        if len(nums) <= 5:
+            return sorted(nums)[k]
+        lows, pivots, highs = partition3(nums, median_of_medians(nums))
+        if k < len(lows):
+            nums = lows
+        elif k < len(lows) + len(pivots):
+            return pivots[0]
+        else:
+            k -= len(lows) + len(pivots)
+            nums = highs
+
+
+def select(nums, k):
+    # Returns the k-th smallest item (0-based) of any iterable
+    nums = list(nums)
+    if not 0 <= k < len(nums):
+        raise IndexError("k out of range")
+    budget = 4 * len(nums)
+    while budget > 0:
+        if len(nums) <= 5:
+            return sorted(nums)[k]
+        budget -= len(nums)
+        lows, pivots, highs = partition3(nums, choice(nums))
+        if k < len(lows):
+            nums = lows
+        elif k < len(lows) + len(pivots):
+            return pivots[0]
+        else:
+            k -= len(lows) + len(pivots)
+            nums = highs
+    return mom_select(nums, k)
+
+
+def find_kth_largest(nums, k):
+    return select(nums, len(nums)-k)
+
+
+def multi_select(nums, ks):
+    # Returns the ks-th smallest items (0-based), in the order of ks
+    nums = list(nums)
+    if any(not 0 <= k < len(nums) for k in ks):
+        raise IndexError("k out of range")
+    found = {}
+    stack = [(nums, sorted(set(ks)), 0)]
+    while stack:
+        nums, ranks, offset = stack.pop()
+        if len(nums) <= 5:
+            nums = sorted(nums)
+            for k in ranks:
+                found[k] = nums[k-offset]
+            continue
+        lows, pivots, highs = partition3(nums, median_of_medians(nums))
+        lo_end, hi_start = offset + len(lows), offset + len(lows) + len(pivots)
+        low_ranks = [k for k in ranks if k < lo_end]
+        high_ranks = [k for k in ranks if k >= hi_start]
+        for k in ranks:
+            if lo_end <= k < hi_start:
+                found[k] = pivots[0]
+        if low_ranks:
+            stack.append((lows, low_ranks, offset))
+        if high_ranks:
+            stack.append((highs, high_ranks, hi_start))
+    return [found[k] for k in ks]
+
+
+def percentiles(nums, ps):
+    # Nearest-rank percentiles, e.g. percentiles(latencies, [50, 95, 99])
+    nums = list(nums)
+    n = len(nums)
+    return multi_select(nums, [min(max(ceil(p / 100 * n), 1), n) - 1 for p in ps])
+
+
+# KLL Sketch
+# Readings:
+# Optimal Quantile Approximation in Streams (Karnin, Lang, Liberty) - https://arxiv.org/abs/1603.05346
+#
+# Items go into a hierarchy of compactors; an item at level h stands for 2^h stream items.
+# When a level is full it is sorted and every other item (random offset) is promoted to
+# the next level. Higher levels get larger capacities, shrinking geometrically by c
+# towards the bottom. Sketches of different streams can be merged level by level.
+class KLLSketch:
+    def __init__(self, k=200, c=2/3):
+        self.k, self.c = k, c
+        self.compactors = [[]]
+        self.size = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def capacity(self, h):
+        height = len(self.compactors) - h - 1
+        return int(ceil(self.k * self.c ** height)) + 1
+
+    def max_size(self):
+        return sum(self.capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, item):
+        self.compactors[0].append(item)
+        self.size += 1
+        self.count += 1
+        if self.size >= self.max_size():
+            self.compress()
+
+    def extend(self, items):
+        for item in items:
+            self.update(item)
+
+    def compress(self):
+        while self.size >= self.max_size():
+            for h, compactor in enumerate(self.compactors):
+                if len(compactor) >= self.capacity(h):
+                    if h + 1 == len(self.compactors):
+                        self.compactors.append([])
+                    compactor.sort()
+                    keep = compactor.pop() if len(compactor) % 2 else None
+                    offset = int(random() < 0.5)
+                    self.compactors[h+1] += compactor[offset::2]
+                    compactor[:] = [] if keep is None else [keep]
+                    break
+            self.size = sum(len(compactor) for compactor in self.compactors)
+
+    def merge(self, other):
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for h, compactor in enumerate(other.compactors):
+            self.compactors[h] += compactor
+        self.size = sum(len(compactor) for compactor in self.compactors)
+        self.count += other.count
+        self.compress()
+
+    def _weighted(self):
+        return sorted(
+            (item, 1 << h) for h, compactor in enumerate(self.compactors) for item in compactor
+        )
+
+    def rank(self, x):
+        # Approximate number of stream items <= x
+        return sum(weight for item, weight in self._weighted() if item <= x)
+
+    def quantiles(self, qs):
+        if not self.count:
+            raise ValueError("sketch is empty")
+        weighted = self._weighted()
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for q in qs:
+            target, acc = q * total, 0
+            for item, weight in weighted:
+                acc += weight
+                if acc >= target:
+                    break
+            results.append(item)
+        return results
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
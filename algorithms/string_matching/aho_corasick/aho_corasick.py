@@ -0,0 +1,75 @@
+# Aho-Corasick: find every occurrence of many patterns in a single pass over the text.
+# Time Complexity: O(sum of pattern lengths) to build, O(len(text) + matches) to search
+#
+# The automaton is a trie of the patterns (one dict of children per node, as in
+# data_structure/trie) plus a failure link per node pointing to the longest proper
+# suffix that is also in the trie. Works on str or bytes, as long as the patterns and
+# the text are of the same type.
+
+from collections import deque
+
+
+class AhoCorasick:
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.out = [[]]
+        for i, pattern in enumerate(self.patterns):
+            if not pattern:
+                raise ValueError("patterns cant be empty")
+            cur = 0
+            for c in pattern:
+                if c not in self.goto[cur]:
+                    self.goto[cur][c] = len(self.goto)
+                    self.goto.append({})
+                    self.out.append([])
+                cur = self.goto[cur][c]
+            self.out[cur].append(i)
+
+        # BFS so that the failure link of a node is final before its children need it
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for c, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and c not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[child] = self.goto[f].get(c, 0)
+                self.out[child] += self.out[self.fail[child]]
+                queue.append(child)
+
+    def step(self, state, c):
+        while state and c not in self.goto[state]:
+            state = self.fail[state]
+        return self.goto[state].get(c, 0)
+
+    def search(self, text):
+        # Yields (start index, pattern) for every match, including overlapping ones
+        state = 0
+        for i, c in enumerate(text):
+            state = self.step(state, c)
+            for p in self.out[state]:
+                yield i - len(self.patterns[p]) + 1, self.patterns[p]
+
+    def stream(self):
+        return AhoCorasickStream(self)
+
+
+# Streaming matcher over chunked input. The automaton state and the absolute offset
+# are carried between chunks, so matches straddling a chunk boundary are still found.
+class AhoCorasickStream:
+    def __init__(self, automaton):
+        self.automaton = automaton
+        self.state = 0
+        self.offset = 0
+
+    def feed(self, chunk):
+        ac, state, offset = self.automaton, self.state, self.offset
+        matches = []
+        for i, c in enumerate(chunk, offset):
+            state = ac.step(state, c)
+            for p in ac.out[state]:
+                matches.append((i - len(ac.patterns[p]) + 1, ac.patterns[p]))
+        self.state, self.offset = state, offset + len(chunk)
+        return matches
@@ -1,6 +1,10 @@
 # LeetCode - 28. Find the Index of the First Occurrence in a String
 # https://leetcode.com/problems/find-the-index-of-the-first-occurrence-in-a-string
 
+import mmap
+import os
+
+
 def strStr(haystack, needle):
     n, h = len(needle), len(haystack)
     i, j, nxt = 1, 0, [-1]+[0]*n
@@ -19,3 +23,64 @@ def strStr(haystack, needle):
         else:
             j = nxt[j]
     return i-j if j == n else -1
+
+
+# KMP matcher: the failure table is built once per needle and reused for every search.
+# Works on str, bytes or memoryview (a bytes needle matches bytes-like haystacks).
+# search() yields every match, including overlapping ones; stream() carries the match
+# state across chunks, so a file can be scanned piece by piece without copies.
+class KMP:
+    def __init__(self, needle):
+        if not needle:
+            raise ValueError("needle cant be empty")
+        n = len(needle)
+        i, j, nxt = 1, 0, [-1]+[0]*n
+        while i < n:
+            if j == -1 or needle[i] == needle[j]:
+                i += 1
+                j += 1
+                nxt[i] = j
+            else:
+                j = nxt[j]
+        self.needle, self.nxt = needle, nxt
+
+    def search(self, haystack):
+        stream = self.stream()
+        for i in stream.feed(haystack):
+            yield i
+
+    def stream(self):
+        return KMPStream(self)
+
+    def search_file(self, path, chunk_size=1 << 20):
+        # The file is mmapped and fed as memoryview slices, which do not copy
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return  # empty files can't be mmapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                stream, view = self.stream(), memoryview(mm)
+                try:
+                    for start in range(0, len(view), chunk_size):
+                        yield from stream.feed(view[start:start+chunk_size])
+                finally:
+                    view.release()
+
+
+class KMPStream:
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.j = 0
+        self.offset = 0
+
+    def feed(self, chunk):
+        needle, nxt, n = self.matcher.needle, self.matcher.nxt, len(self.matcher.needle)
+        j, matches = self.j, []
+        for i, c in enumerate(chunk, self.offset):
+            while j != -1 and c != needle[j]:
+                j = nxt[j]
+            j += 1
+            if j == n:
+                matches.append(i-n+1)
+                j = nxt[n]
+        self.j, self.offset = j, self.offset + len(chunk)
+        return matches
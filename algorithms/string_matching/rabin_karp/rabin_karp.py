@@ -1,9 +1,13 @@
 # LeetCode - 28. Find the Index of the First Occurrence in a String
 # https://leetcode.com/problems/find-the-index-of-the-first-occurrence-in-a-string
 
-# Using built-in hash function
+import mmap
+import os
 import sys
+from collections import deque
+
 
+# Using built-in hash function
 
 def strStr(haystack, needle):
     n, h = len(needle), len(haystack)
@@ -17,19 +21,85 @@ def strStr(haystack, needle):
 # Using rolling hash
 def strStr(haystack, needle):
     def f(c):
-        return ord(c)-ord('A')
+        return ord(c)
 
-    n, h, d, m = len(needle), len(haystack), ord('z')-ord('A')+1, sys.maxsize
+    n, h, d, m = len(needle), len(haystack), 256, sys.maxsize
     if n > h:
         return -1
     nd, hash_n, hash_h = d**(n-1), 0, 0
     for i in range(n):
         hash_n = (d*hash_n+f(needle[i])) % m
         hash_h = (d*hash_h+f(haystack[i])) % m
-    if hash_n == hash_h:
+    # A hash hit is only a candidate, so it is verified against the needle
+    if hash_n == hash_h and haystack[:n] == needle:
         return 0
     for i in range(1, h-n+1):
         hash_h = (d*(hash_h-f(haystack[i-1])*nd)+f(haystack[i+n-1])) % m
-        if hash_n == hash_h:
+        if hash_n == hash_h and haystack[i:i+n] == needle:
             return i
     return -1
+
+
+# Rabin-Karp matcher: the needle hash and the leading power are computed once.
+# Works on str, bytes or memoryview. The last len(needle) items are kept in a deque,
+# so the rolling hash and the verification of hash hits never slice the haystack,
+# and stream() can carry that window across chunks.
+class RabinKarp:
+    D, M = 256, (1 << 61) - 1
+
+    def __init__(self, needle):
+        if not needle:
+            raise ValueError("needle cant be empty")
+        self.needle = [self.code(c) for c in needle]
+        self.nd = pow(self.D, len(needle)-1, self.M)
+        self.hash_n = 0
+        for c in self.needle:
+            self.hash_n = (self.D*self.hash_n+c) % self.M
+
+    @staticmethod
+    def code(c):
+        return c if isinstance(c, int) else ord(c)
+
+    def search(self, haystack):
+        stream = self.stream()
+        for i in stream.feed(haystack):
+            yield i
+
+    def stream(self):
+        return RabinKarpStream(self)
+
+    def search_file(self, path, chunk_size=1 << 20):
+        # The file is mmapped and fed as memoryview slices, which do not copy
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return  # empty files can't be mmapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                stream, view = self.stream(), memoryview(mm)
+                try:
+                    for start in range(0, len(view), chunk_size):
+                        yield from stream.feed(view[start:start+chunk_size])
+                finally:
+                    view.release()
+
+
+class RabinKarpStream:
+    def __init__(self, matcher):
+        self.matcher = matcher
+        self.window = deque(maxlen=len(matcher.needle))
+        self.hash_h = 0
+        self.offset = 0
+
+    def feed(self, chunk):
+        rk, window, hash_h = self.matcher, self.window, self.hash_h
+        n, d, m, nd, code = len(rk.needle), rk.D, rk.M, rk.nd, rk.code
+        matches = []
+        for i, c in enumerate(chunk, self.offset):
+            c = code(c)
+            if len(window) == n:
+                hash_h -= window[0]*nd
+            window.append(c)
+            hash_h = (d*hash_h+c) % m
+            if hash_h == rk.hash_n and len(window) == n and list(window) == rk.needle:
+                matches.append(i-n+1)
+        self.hash_h, self.offset = hash_h, self.offset + len(chunk)
+        return matches
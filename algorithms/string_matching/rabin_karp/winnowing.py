@@ -0,0 +1,74 @@
+# Document fingerprinting with rolling hashes and winnowing, for near-duplicate detection.
+# Readings:
+# Winnowing: Local Algorithms for Document Fingerprinting (Schleimer, Wilkerson, Aiken) -
+# https://theory.stanford.edu/~aiken/publications/papers/sigmod03.pdf
+#
+# The hashes of all k-grams are computed at once with NumPy: the same recurrence as the
+# rolling hash in rabin_karp.py (hash = d*hash + c), applied to the whole shifted array
+# per step, with arithmetic modulo 2**64 through uint64 overflow.
+# Winnowing keeps the minimum hash of every window of w consecutive k-gram hashes,
+# which guarantees that any shared substring of length >= w+k-1 shares a fingerprint.
+
+from collections import Counter, defaultdict
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+D = np.uint64(1_000_003)
+
+
+def kgram_hashes(text, k):
+    data = text.encode() if isinstance(text, str) else bytes(text)
+    codes = np.frombuffer(data, dtype=np.uint8).astype(np.uint64)
+    n = len(codes) - k + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.uint64)
+    hashes = np.zeros(n, dtype=np.uint64)
+    for j in range(k):
+        hashes = hashes * D + codes[j:j+n]
+    return hashes
+
+
+def winnow(hashes, w):
+    # Returns the positions and values of the selected fingerprints.
+    # Ties pick the rightmost minimum, so a run of equal minima is selected once.
+    if len(hashes) == 0:
+        return np.empty(0, dtype=np.int64), hashes
+    if len(hashes) < w:
+        w = len(hashes)
+    windows = sliding_window_view(hashes, w)
+    picks = np.arange(len(windows)) + (w - 1 - np.argmin(windows[:, ::-1], axis=1))
+    picks = np.unique(picks)
+    return picks, hashes[picks]
+
+
+def fingerprints(text, k=5, w=4):
+    _, values = winnow(kgram_hashes(text, k), w)
+    return set(values.tolist())
+
+
+class WinnowingIndex:
+    def __init__(self, k=5, w=4):
+        self.k, self.w = k, w
+        self.postings = defaultdict(list)
+        self.sizes = {}
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def add(self, doc_id, text):
+        if doc_id in self.sizes:
+            raise ValueError(f"document {doc_id} already indexed")
+        prints = fingerprints(text, self.k, self.w)
+        for h in prints:
+            self.postings[h].append(doc_id)
+        self.sizes[doc_id] = len(prints)
+
+    def query(self, text, min_shared=1):
+        # Only the posting lists of the query's fingerprints are touched, so the cost
+        # depends on the number of candidate matches, not on the number of documents.
+        # Returns [(doc_id, shared fingerprints)], most similar first.
+        shared = Counter()
+        for h in fingerprints(text, self.k, self.w):
+            shared.update(self.postings.get(h, ()))
+        return [(doc_id, cnt) for doc_id, cnt in shared.most_common() if cnt >= min_shared]
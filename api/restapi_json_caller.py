@@ -1,21 +1,43 @@
+import asyncio
+import copy
+import hashlib
+import json
+import shelve
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
 from dataclasses import dataclass, field
+from typing import ClassVar, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 
 @dataclass
 class RestApiJsonCaller:
     """Simplifying the usage of requests library. Inherent this class and override the `doamin_url`.
+    All instances of a class share one `requests.Session`, so connections are pooled and kept alive
+    across calls. Override `pool_connections`/`pool_maxsize` in the subclass to size the pool.
+    Set `cache` to a `ResponseCache` in the subclass to cache `get()` responses.
     Returns:
         Tuple[int, dict]: Response code and the json dict for the response (text if failed to parse to json).
     """
 
+    pool_connections: ClassVar[int] = 10
+    pool_maxsize: ClassVar[int] = 100
+    _sessions: ClassVar[dict] = {}
+    _sessions_lock: ClassVar[threading.Lock] = threading.Lock()
+    cache: ClassVar[Optional['ResponseCache']] = None
+    cache_key_headers: ClassVar[tuple] = ('Accept', 'Authorization')
+
     path: str = ''
     bearer_token: str = ''
     headers: dict = field(default_factory=dict)
     params: dict = field(default_factory=dict)
     data: dict = field(default_factory=dict)
     domain_url: str = "https://postman-echo.com"
+    timeout: float = 30
 
     def __post_init__(self):
         self.headers['Content-Type'] = 'application/json'
@@ -23,16 +45,40 @@ class RestApiJsonCaller:
         if self.bearer_token:
             self.headers['Authorization'] = f'Bearer {self.bearer_token}'
 
+    @classmethod
+    def session(cls):
+        if cls not in cls._sessions:
+            with cls._sessions_lock:
+                if cls not in cls._sessions:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=cls.pool_connections,
+                                          pool_maxsize=cls.pool_maxsize)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    cls._sessions[cls] = session
+        return cls._sessions[cls]
+
+    @classmethod
+    def close_session(cls):
+        with cls._sessions_lock:
+            session = cls._sessions.pop(cls, None)
+        if session is not None:
+            session.close()
+
     def get(self):
-        return self.__request_template(requests.get,
+        if self.cache is not None:
+            return self.__cached_get()
+        return self.__request_template(self.session().get,
                                        headers=self.headers,
-                                       params=self.params,)
+                                       params=self.params,
+                                       timeout=self.timeout,)
 
     def post(self):
-        return self.__request_template(requests.post,
+        return self.__request_template(self.session().post,
                                        headers=self.headers,
                                        params=self.params,
-                                       json=self.data,)
+                                       json=self.data,
+                                       timeout=self.timeout,)
 
     def _process_response(self, response):
         if response.status_code // 100 == 2:
@@ -48,11 +94,220 @@ class RestApiJsonCaller:
 
     def __request_template(self, request_func, *args, **kwargs):
         try:
-            response = request_func(url=self.__get_url(), *args, **kwargs)
+            response = request_func(url=self._get_url(), *args, **kwargs)
             self._process_response(response)
             return self._format_response(response)
         except Exception as e:
             return 0, {'RestApiJsonCaller error': e}
 
-    def __get_url(self):
-        return f"{self.domain_url}/{f'{self.path}/' if self.path else ''}"
\ No newline at end of file
+    def __cached_get(self):
+        def fetch(conditional_headers):
+            response = self.session().get(url=self._get_url(),
+                                          headers={**self.headers, **conditional_headers},
+                                          params=self.params,
+                                          timeout=self.timeout,)
+            if response.status_code != 304:
+                self._process_response(response)
+            return response
+
+        try:
+            return self.cache.get_or_fetch(self._cache_key('GET'), fetch, self._format_response)
+        except Exception as e:
+            return 0, {'RestApiJsonCaller error': e}
+
+    def _cache_key(self, method):
+        # Hashed, so that credentials in the key headers are never kept in memory or on disk
+        return hashlib.sha256(json.dumps([
+            method,
+            self._get_url(),
+            sorted(self.params.items()),
+            [self.headers.get(header) for header in self.cache_key_headers],
+        ], default=str).encode()).hexdigest()
+
+    def _get_url(self):
+        return f"{self.domain_url}/{f'{self.path}/' if self.path else ''}"
+
+
+@dataclass
+class CachedResponse:
+    result: tuple
+    etag: Optional[str]
+    last_modified: Optional[str]
+    expires_at: float
+
+
+class ResponseCache:
+    """LRU + TTL cache for `RestApiJsonCaller.get()` results.
+    - At most `maxsize` entries are kept in memory, least recently used are evicted first.
+    - Expired entries with an ETag/Last-Modified are revalidated with a conditional request,
+      and a 304 refreshes them without transferring the body again.
+    - Concurrent identical requests are coalesced: only one goes out and the others wait for it.
+    - With `path`, entries are also persisted in a `shelve` file and survive restarts. Once it
+      holds more than `disk_maxsize` entries, the ones expiring first are evicted.
+    Only 2XX responses are cached, and every caller gets its own copy of the result.
+    `stats()` returns the hit/miss counters.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, path=None, disk_maxsize=None):
+        self.maxsize = maxsize
+        self.disk_maxsize = disk_maxsize or 10 * maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.disk = shelve.open(path) if path else None
+        self.hits = self.misses = self.revalidated = self.coalesced = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidated': self.revalidated,
+                'coalesced': self.coalesced,
+                'size': len(self.entries),
+            }
+
+    def close(self):
+        if self.disk is not None:
+            self.disk.close()
+
+    def get_or_fetch(self, key, fetch, parse):
+        # fetch(conditional_headers) -> response, parse(response) -> cached result
+        # Results are shared with the cache, so callers get a copy they are free to mutate
+        with self.lock:
+            entry = self._lookup(key)
+            if entry is not None and entry.expires_at > time.time():
+                self.hits += 1
+                return copy.deepcopy(entry.result)
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            result = self._fetch(key, entry, fetch, parse)
+            future.set_result(result)
+            return copy.deepcopy(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    def _fetch(self, key, entry, fetch, parse):
+        conditional_headers = {}
+        if entry is not None and entry.etag:
+            conditional_headers['If-None-Match'] = entry.etag
+        if entry is not None and entry.last_modified:
+            conditional_headers['If-Modified-Since'] = entry.last_modified
+
+        response = fetch(conditional_headers)
+        if response.status_code == 304 and entry is not None:
+            entry.expires_at = time.time() + self.ttl
+            with self.lock:
+                self.revalidated += 1
+                self._store(key, entry)
+            return entry.result
+
+        result = parse(response)
+        if response.status_code // 100 == 2:
+            entry = CachedResponse(result,
+                                   response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'),
+                                   time.time() + self.ttl)
+            with self.lock:
+                self._store(key, entry)
+        return result
+
+    def _lookup(self, key):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.disk is not None and key in self.disk:
+            entry = self.disk[key]
+            self._store(key, entry, persist=False)
+        return entry
+
+    def _store(self, key, entry, persist=True):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        if persist and self.disk is not None:
+            self.disk[key] = entry
+            if len(self.disk) > self.disk_maxsize:
+                self._evict_disk()
+
+    def _evict_disk(self):
+        # Down to 90% of disk_maxsize in one pass over the file, so the scan is amortized
+        expiries = sorted((self.disk[key].expires_at, key) for key in self.disk.keys())
+        for _, key in expiries[:len(expiries) - int(self.disk_maxsize * 0.9)]:
+            del self.disk[key]
+
+
+@dataclass
+class AsyncRestApiJsonCaller(RestApiJsonCaller):
+    """Async version of `RestApiJsonCaller` on top of `httpx.AsyncClient`, with the same fields and returns.
+    One client (and connection pool) is shared per class and event loop; call `aclose_client()` on shutdown.
+    `cache` is not supported and is ignored by the async caller.
+    """
+
+    _clients: ClassVar[dict] = {}
+
+    @classmethod
+    def client(cls):
+        key = (cls, asyncio.get_running_loop())
+        if key not in cls._clients:
+            import httpx  # optional, only needed by the async caller
+
+            limits = httpx.Limits(max_connections=cls.pool_maxsize,
+                                  max_keepalive_connections=cls.pool_maxsize)
+            cls._clients[key] = httpx.AsyncClient(limits=limits)
+        return cls._clients[key]
+
+    @classmethod
+    async def aclose_client(cls):
+        client = cls._clients.pop((cls, asyncio.get_running_loop()), None)
+        if client is not None:
+            await client.aclose()
+
+    async def get(self):
+        return await self.__request_template(self.client().get,
+                                             headers=self.headers,
+                                             params=self.params,
+                                             timeout=self.timeout,)
+
+    async def post(self):
+        return await self.__request_template(self.client().post,
+                                             headers=self.headers,
+                                             params=self.params,
+                                             json=self.data,
+                                             timeout=self.timeout,)
+
+    async def __request_template(self, request_func, *args, **kwargs):
+        try:
+            response = await request_func(url=self._get_url(), *args, **kwargs)
+            self._process_response(response)
+            return self._format_response(response)
+        except Exception as e:
+            return 0, {'AsyncRestApiJsonCaller error': e}
+
+
+async def gather_many(calls, concurrency=10):
+    """Runs the coroutine functions in `calls` (e.g. `[caller.get for caller in callers]`)
+    with at most `concurrency` of them in flight. Returns the results in the order of `calls`.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(call):
+        async with semaphore:
+            return await call()
+
+    return await asyncio.gather(*(run(call) for call in calls))
\ No newline at end of file
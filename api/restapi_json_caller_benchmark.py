@@ -0,0 +1,90 @@
+# Requests/second of RestApiJsonCaller against a local stub HTTP server, run in its own
+# process so that it does not share the interpreter lock with the clients being measured:
+# one connection per call (the previous behaviour), the pooled session,
+# the pooled session from a thread pool, and the async caller through gather_many.
+
+import asyncio
+import json
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import perf_counter
+
+import requests
+
+from restapi_json_caller import AsyncRestApiJsonCaller, RestApiJsonCaller, gather_many
+
+CALLS = 2000
+CONCURRENCY = 32
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(ports):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+@dataclass
+class UnpooledCaller(RestApiJsonCaller):
+    def get(self):
+        return self._format_response(
+            requests.get(self._get_url(), headers=self.headers, params=self.params, timeout=self.timeout)
+        )
+
+
+def report(name, start):
+    elapsed = perf_counter() - start
+    print(f"{name:>32}: {CALLS / elapsed:8.0f} requests/s")
+
+
+if __name__ == "__main__":
+    ports = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(ports,), daemon=True)
+    server.start()
+    domain_url = f"http://127.0.0.1:{ports.get()}"
+
+    start = perf_counter()
+    for i in range(CALLS):
+        assert UnpooledCaller(path=str(i), domain_url=domain_url).get()[0] == 200
+    report('new connection per call', start)
+
+    start = perf_counter()
+    for i in range(CALLS):
+        assert RestApiJsonCaller(path=str(i), domain_url=domain_url).get()[0] == 200
+    report('pooled session', start)
+
+    start = perf_counter()
+    with ThreadPoolExecutor(CONCURRENCY) as executor:
+        results = executor.map(lambda i: RestApiJsonCaller(path=str(i), domain_url=domain_url).get(),
+                               range(CALLS))
+        assert all(code == 200 for code, _ in results)
+    report(f'pooled session, {CONCURRENCY} threads', start)
+
+    async def run_async():
+        callers = [AsyncRestApiJsonCaller(path=str(i), domain_url=domain_url) for i in range(CALLS)]
+        start = perf_counter()
+        results = await gather_many([caller.get for caller in callers], concurrency=CONCURRENCY)
+        report(f'async, concurrency={CONCURRENCY}', start)
+        assert all(code == 200 for code, _ in results)
+        await AsyncRestApiJsonCaller.aclose_client()
+
+    asyncio.run(run_async())
+    server.terminate()
+    server.join()
@@ -0,0 +1,142 @@
+# Compact trie stored in flat arrays instead of nested dicts.
+# Every node costs ~13 bytes: first child, next sibling and label as uint32,
+# plus one terminal byte. Node 0 is the root, so 0 doubles as "no node".
+#
+# save() writes the trie in BFS order, where the children of each node are contiguous
+# and sorted by label. MappedTrie mmaps that file and answers queries straight from
+# the page cache with a binary search per level, so opening it costs nothing.
+
+import mmap
+import struct
+from array import array
+
+MAGIC = b'TRIE'
+HEADER = struct.Struct('<4sIQ')
+
+
+class CompactTrie:
+    def __init__(self, words=()):
+        self.first_child = array('I', [0])
+        self.next_sibling = array('I', [0])
+        self.label = array('I', [0])
+        self.terminal = bytearray(1)
+        for word in words:
+            self.insert(word)
+
+    def __len__(self):
+        return len(self.label)
+
+    def _child(self, node, code):
+        child = self.first_child[node]
+        while child and self.label[child] != code:
+            child = self.next_sibling[child]
+        return child
+
+    def _walk(self, word):
+        cur = 0
+        for c in word:
+            cur = self._child(cur, ord(c))
+            if not cur:
+                return -1
+        return cur
+
+    def insert(self, word):
+        cur = 0
+        for c in word:
+            code = ord(c)
+            child = self._child(cur, code)
+            if not child:
+                child = len(self.label)
+                self.label.append(code)
+                self.first_child.append(0)
+                self.next_sibling.append(self.first_child[cur])
+                self.terminal.append(0)
+                self.first_child[cur] = child
+            cur = child
+        self.terminal[cur] = 1
+
+    def search(self, word):
+        cur = self._walk(word)
+        return cur >= 0 and bool(self.terminal[cur])
+
+    def startswith(self, prefix):
+        return self._walk(prefix) >= 0
+
+    def delete(self, word):
+        cur = self._walk(word)
+        if cur >= 0 and self.terminal[cur]:
+            self.terminal[cur] = 0
+            return True
+        return False
+
+    def save(self, path):
+        order, starts = [0], array('I', [1])
+        i = 0
+        while i < len(order):
+            node, children = order[i], []
+            child = self.first_child[node]
+            while child:
+                children.append(child)
+                child = self.next_sibling[child]
+            children.sort(key=self.label.__getitem__)
+            order.extend(children)
+            starts.append(starts[-1] + len(children))
+            i += 1
+
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, 1, len(order)))
+            starts.tofile(f)
+            array('I', (self.label[node] for node in order)).tofile(f)
+            f.write(bytes(self.terminal[node] for node in order))
+
+
+class MappedTrie:
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or version != 1:
+            raise ValueError(f"{path} is not a compact trie file")
+        view = memoryview(self.mm)
+        starts_at = HEADER.size
+        labels_at = starts_at + 4 * (n + 1)
+        terminal_at = labels_at + 4 * n
+        self.starts = view[starts_at:labels_at].cast('I')
+        self.labels = view[labels_at:terminal_at].cast('I')
+        self.terminal = view[terminal_at:terminal_at + n]
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in (self.starts, self.labels, self.terminal):
+            view.release()
+        self.mm.close()
+
+    def _walk(self, word):
+        cur = 0
+        for c in word:
+            code, lo, hi = ord(c), self.starts[cur], self.starts[cur+1]
+            while lo < hi:
+                mid = lo + (hi - lo) // 2
+                if self.labels[mid] >= code:
+                    hi = mid
+                else:
+                    lo = mid + 1
+            if lo == self.starts[cur+1] or self.labels[lo] != code:
+                return -1
+            cur = lo
+        return cur
+
+    def search(self, word):
+        cur = self._walk(word)
+        return cur >= 0 and bool(self.terminal[cur])
+
+    def startswith(self, prefix):
+        return self._walk(prefix) >= 0
@@ -0,0 +1,77 @@
+# Minimal DAWG (directed acyclic word graph) built from sorted words in one pass.
+# It is a trie where identical subtrees are stored once, so common suffixes are shared
+# as well as common prefixes. Uses the incremental algorithm of Daciuk et al.:
+# once a word is added, the part of the previous word that is no longer on the current
+# path can never change again, so it is merged into a register of unique nodes.
+# The result is read-only, since a node may be shared by many words.
+
+class DawgNode:
+    __slots__ = ('children', 'final')
+
+    def __init__(self):
+        self.children = {}
+        self.final = False
+
+    def key(self):
+        return self.final, tuple((c, id(child)) for c, child in self.children.items())
+
+
+class Dawg:
+    def __init__(self):
+        self.root = DawgNode()
+
+    @classmethod
+    def from_sorted(cls, words):
+        dawg = cls()
+        register, unchecked, prev = {}, [], ''
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, c, child = unchecked.pop()
+                key = child.key()
+                if key in register:
+                    parent.children[c] = register[key]
+                else:
+                    register[key] = child
+
+        for word in words:
+            if word < prev:
+                raise ValueError("words must be sorted")
+            common = 0
+            while common < min(len(prev), len(word)) and prev[common] == word[common]:
+                common += 1
+            minimize(common)
+            cur = unchecked[-1][2] if unchecked else dawg.root
+            for c in word[common:]:
+                child = DawgNode()
+                cur.children[c] = child
+                unchecked.append((cur, c, child))
+                cur = child
+            cur.final = True
+            prev = word
+        minimize(0)
+        return dawg
+
+    def _walk(self, word):
+        cur = self.root
+        for c in word:
+            if c not in cur.children:
+                return None
+            cur = cur.children[c]
+        return cur
+
+    def search(self, word):
+        cur = self._walk(word)
+        return cur is not None and cur.final
+
+    def startswith(self, prefix):
+        return self._walk(prefix) is not None
+
+    def __iter__(self):
+        stack = [(self.root, '')]
+        while stack:
+            node, word = stack.pop()
+            if node.final:
+                yield word
+            for c in sorted(node.children, reverse=True):
+                stack.append((node.children[c], word + c))
@@ -0,0 +1,80 @@
+# Trie with weighted words and top-k prefix completion.
+# Every node caches the best `k` (score, word) pairs of its subtree, so complete()
+# only walks the prefix and slices the cache: O(len(prefix) + k), independent of
+# how many words share the prefix. Updates refresh the caches along the word's path.
+
+from heapq import nlargest
+from operator import itemgetter
+
+
+class TopKNode:
+    __slots__ = ('children', 'score', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.score = None
+        self.top = []
+
+
+class TopKTrie:
+    def __init__(self, k=10):
+        self.k = k
+        self.root = TopKNode()
+
+    def _path(self, word):
+        path, cur = [self.root], self.root
+        for c in word:
+            if c not in cur.children:
+                return None
+            cur = cur.children[c]
+            path.append(cur)
+        return path
+
+    def _refresh(self, path, word):
+        # Rebuild the caches bottom-up, so lowered or removed scores are handled too
+        for depth in range(len(path)-1, -1, -1):
+            node = path[depth]
+            candidates = [pair for child in node.children.values() for pair in child.top]
+            if node.score is not None:
+                candidates.append((node.score, word[:depth]))
+            node.top = nlargest(self.k, candidates, key=itemgetter(0))
+
+    def insert(self, word, score):
+        path, cur = [self.root], self.root
+        for c in word:
+            if c not in cur.children:
+                cur.children[c] = TopKNode()
+            cur = cur.children[c]
+            path.append(cur)
+        cur.score = score
+        self._refresh(path, word)
+
+    def search(self, word):
+        path = self._path(word)
+        return path is not None and path[-1].score is not None
+
+    def startswith(self, prefix):
+        return self._path(prefix) is not None
+
+    def delete(self, word):
+        path = self._path(word)
+        if path is None or path[-1].score is None:
+            return False
+        path[-1].score = None
+        # Drop the nodes that no longer lead to any word
+        depth = len(path) - 1
+        while depth and path[depth].score is None and not path[depth].children:
+            del path[depth-1].children[word[depth-1]]
+            depth -= 1
+        self._refresh(path[:depth+1], word)
+        return True
+
+    def complete(self, prefix, k=None):
+        if k is None:
+            k = self.k
+        elif k > self.k:
+            raise ValueError(f"k={k} is larger than the {self.k} completions cached per node")
+        path = self._path(prefix)
+        if path is None:
+            return []
+        return [word for _, word in path[-1].top[:k]]
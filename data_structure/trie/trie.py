@@ -15,7 +15,7 @@ def trie_search(trie, word):
         if c not in cur:
             return False
         cur = cur[c]
-    return True
+    return '' in cur
 
 def trie_startswith(trie, prefix):
     cur = trie
@@ -26,12 +26,36 @@ def trie_startswith(trie, prefix):
     return True
 
 def trie_delete(trie, word):
-    cur = trie
+    cur, path = trie, []
     for c in word:
         if c not in cur:
             return False
+        path.append(cur)
         cur = cur[c]
-    if '' in cur:
-        cur.pop('')
-        return True
-    return False
+    if '' not in cur:
+        return False
+    cur.pop('')
+    # Prune the branch that no longer leads to any word
+    for parent, c in zip(reversed(path), reversed(word)):
+        if parent[c]:
+            break
+        parent.pop(c)
+    return True
+
+# Builds the trie in one pass over sorted words. Only the part of each word that differs
+# from the previous one is created; the shared prefix is reused from the current path.
+def trie_from_sorted(words):
+    root = trie_fac()
+    path, prev = [root], ''
+    for word in words:
+        if word < prev:
+            raise ValueError("words must be sorted")
+        common = 0
+        while common < min(len(prev), len(word)) and prev[common] == word[common]:
+            common += 1
+        del path[common+1:]
+        for c in word[common:]:
+            path.append(path[-1][c])
+        path[-1][''] = True
+        prev = word
+    return root
@@ -0,0 +1,101 @@
+# Disjoint Set Data Structure with Rollback
+# Union by rank without path compression keeps every tree O(log n) deep,
+# and every union touches at most two slots, so it can be undone in O(1).
+
+class RollbackUnionFind:
+    def __init__(self, size):
+        self.root = list(range(size))
+        self.rank = [0] * size
+        self.groups = size
+        self.history = []
+
+    def find(self, x):
+        while self.root[x] != x:
+            x = self.root[x]
+        return x
+
+    def union(self, x, y):
+        x_set, y_set = self.find(x), self.find(y)
+        if x_set == y_set:
+            self.history.append(None)
+            return False
+        if self.rank[x_set] < self.rank[y_set]:
+            x_set, y_set = y_set, x_set
+        rank_grew = self.rank[x_set] == self.rank[y_set]
+        self.root[y_set] = x_set
+        if rank_grew:
+            self.rank[x_set] += 1
+        self.groups -= 1
+        self.history.append((x_set, y_set, rank_grew))
+        return True
+
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
+
+    def snapshot(self):
+        return len(self.history)
+
+    def rollback(self, token):
+        while len(self.history) > token:
+            change = self.history.pop()
+            if change is None:
+                continue
+            x_set, y_set, rank_grew = change
+            self.root[y_set] = y_set
+            if rank_grew:
+                self.rank[x_set] -= 1
+            self.groups += 1
+
+
+# Offline Dynamic Connectivity (divide and conquer over time)
+# operations: a list of ('add', u, v), ('remove', u, v) or ('query', u, v) in time order.
+# Returns the answer of every query, i.e. whether u and v were connected at that time.
+# Each edge is alive over an interval of operations. The interval is split over the
+# O(log T) segment tree nodes covering it, and a DFS over the tree applies the edges on
+# the way down and rolls them back on the way up. Total work is O(T log T log n).
+def offline_connectivity(size, operations):
+    t = len(operations)
+    if t == 0:
+        return []
+    tree = [[] for _ in range(4 * t)]
+
+    def insert(node, lo, hi, left, right, edge):
+        if right <= lo or hi <= left:
+            return
+        if left <= lo and hi <= right:
+            tree[node].append(edge)
+            return
+        mid = (lo + hi) // 2
+        insert(2*node, lo, mid, left, right, edge)
+        insert(2*node+1, mid, hi, left, right, edge)
+
+    alive = {}
+    for i, (op, u, v) in enumerate(operations):
+        edge = (min(u, v), max(u, v))
+        if op == 'add':
+            alive.setdefault(edge, []).append(i)
+        elif op == 'remove':
+            insert(1, 0, t, alive[edge].pop(), i, edge)
+    for edge, starts in alive.items():
+        for start in starts:
+            insert(1, 0, t, start, t, edge)
+
+    uf = RollbackUnionFind(size)
+    answers = {}
+
+    def dfs(node, lo, hi):
+        token = uf.snapshot()
+        for u, v in tree[node]:
+            uf.union(u, v)
+        if hi - lo == 1:
+            op, u, v = operations[lo]
+            if op == 'query':
+                answers[lo] = uf.connected(u, v)
+        else:
+            mid = (lo + hi) // 2
+            dfs(2*node, lo, mid)
+            dfs(2*node+1, mid, hi)
+        uf.rollback(token)
+
+    dfs(1, 0, t)
+    return [answers[i] for i in sorted(answers)]
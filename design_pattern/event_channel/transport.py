@@ -0,0 +1,321 @@
+# Cross-process transports for EventChannel, for fan-out between local processes without a broker.
+# A transport has three methods:
+#   send(event, args_list): broadcast a batch of events to every listening process
+#   listen(callback): start a receiver thread calling callback(event, args_list)
+#   close(): stop receiving and release resources
+# Create the transport in the parent and pass it to the worker processes, then give each
+# process its own `EventChannel(transport=transport)`.
+
+import ctypes
+import logging
+import os
+import pickle
+import queue
+import socket
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from multiprocessing import Lock, shared_memory
+
+logger = logging.getLogger(__name__)
+
+RECORD = struct.Struct('<IQ')  # payload length, sequence number
+# Header in the first cache line, as uint64s: the committed write position, the end
+# reserved by the write in progress, the sequence number of the next message and the
+# position of the oldest record not overwritten yet. It is accessed through ctypes, which
+# reads and writes each field with one aligned 8-byte copy, while struct.pack_into zeroes
+# the field before packing and a reader in another process could see it at 0.
+HEADER = ctypes.c_uint64 * 4
+WRITE_POS, RESERVED_POS, NEXT_SEQ, TAIL_POS = range(4)
+DATA_OFFSET = 64
+
+
+class SharedMemoryTransport:
+    """Broadcast ring buffer in `multiprocessing.shared_memory`.
+    Messages are appended as [length][sequence number][pickled (event, args_list)] at a
+    monotonically increasing write position, under a cross-process lock. Readers never
+    consume: every listener keeps its own read position and polls the write position, so
+    each message reaches every process. Payloads are unpickled straight from the shared
+    buffer, without an intermediate copy, unless they wrap around the end of the ring.
+    The writer publishes the end of the region it is about to overwrite before copying,
+    so a reader detects a record overwritten while it was reading it, as in a seqlock.
+    A listener that falls more than `capacity` bytes behind resumes from the oldest record
+    still intact. The overwritten messages it missed are counted in `dropped`.
+    Other processes share the transport by receiving it pickled, which carries the lock
+    that serializes their writes along with the segment name.
+    """
+
+    def __init__(self, capacity=1 << 24):
+        # Only the creating process unlinks the segment, including after a fork
+        self.owner = os.getpid()
+        self.shm = shared_memory.SharedMemory(create=True, size=DATA_OFFSET + capacity)
+        self.capacity = self.shm.size - DATA_OFFSET
+        self.header = HEADER.from_buffer(self.shm.buf)
+        self.lock = Lock()
+        self.stopped = threading.Event()
+        self.thread = None
+        self.dropped = 0
+
+    def __getstate__(self):
+        return {'name': self.shm.name, 'capacity': self.capacity, 'lock': self.lock}
+
+    def __setstate__(self, state):
+        self.owner = None
+        self.shm = shared_memory.SharedMemory(name=state['name'])
+        self.capacity = state['capacity']
+        self.header = HEADER.from_buffer(self.shm.buf)
+        self.lock = state['lock']
+        self.stopped = threading.Event()
+        self.thread = None
+        self.dropped = 0
+
+    def __del__(self):
+        # The header must let go of the buffer before the segment is garbage collected
+        self.header = None
+
+    def _write_pos(self):
+        return self.header[WRITE_POS]
+
+    def _lapped(self, read_pos):
+        # Whether any byte from read_pos on may have been overwritten
+        return self.header[RESERVED_POS] - read_pos > self.capacity
+
+    def _copy_in(self, pos, data):
+        start = pos % self.capacity
+        first = min(len(data), self.capacity - start)
+        buf = self.shm.buf
+        buf[DATA_OFFSET+start:DATA_OFFSET+start+first] = data[:first]
+        buf[DATA_OFFSET:DATA_OFFSET+len(data)-first] = data[first:]
+
+    def _view(self, pos, size):
+        start = pos % self.capacity
+        buf = self.shm.buf
+        if start + size <= self.capacity:
+            return buf[DATA_OFFSET+start:DATA_OFFSET+start+size]
+        first = self.capacity - start
+        return bytes(buf[DATA_OFFSET+start:DATA_OFFSET+self.capacity]) + \
+            bytes(buf[DATA_OFFSET:DATA_OFFSET+size-first])
+
+    def send(self, event, args_list):
+        payload = pickle.dumps((event, args_list), protocol=pickle.HIGHEST_PROTOCOL)
+        if RECORD.size + len(payload) > self.capacity:
+            raise ValueError("message is larger than the ring buffer")
+        with self.lock:
+            header = self.header
+            pos, seq = header[WRITE_POS], header[NEXT_SEQ]
+            record = RECORD.pack(len(payload), seq) + payload
+            end = pos + len(record)
+            # Move the tail past the records this write overwrites
+            tail = header[TAIL_POS]
+            while tail < end - self.capacity:
+                tail += RECORD.size + RECORD.unpack(bytes(self._view(tail, RECORD.size)))[0]
+            header[TAIL_POS] = tail
+            header[RESERVED_POS] = end
+            self._copy_in(pos, record)
+            header[NEXT_SEQ] = seq + 1
+            header[WRITE_POS] = end
+
+    def listen(self, callback):
+        self.thread = threading.Thread(target=self._receive, args=(callback,), daemon=True)
+        self.thread.start()
+
+    def _resume(self, expected_seq):
+        # Oldest intact record and its sequence number, and the number of messages lost
+        with self.lock:
+            read_pos, write_pos = self.header[TAIL_POS], self.header[WRITE_POS]
+            if read_pos < write_pos:
+                seq = RECORD.unpack(bytes(self._view(read_pos, RECORD.size)))[1]
+            else:
+                seq = self.header[NEXT_SEQ]
+        return read_pos, seq, seq - expected_seq
+
+    def _receive(self, callback):
+        with self.lock:
+            read_pos, expected_seq = self.header[WRITE_POS], self.header[NEXT_SEQ]
+        idle = 0
+        while not self.stopped.is_set():
+            write_pos = self._write_pos()
+            if write_pos == read_pos:
+                # Spin briefly, then back off up to 1ms while idle
+                idle += 1
+                if idle > 100:
+                    time.sleep(min((idle - 100) * 1e-5, 1e-3))
+                continue
+            idle = 0
+            if self._lapped(read_pos):
+                read_pos, expected_seq, lost = self._resume(expected_seq)
+                self.dropped += lost
+                continue
+
+            size, seq = RECORD.unpack(bytes(self._view(read_pos, RECORD.size)))
+            if self._lapped(read_pos):
+                continue
+            view = self._view(read_pos + RECORD.size, size)
+            try:
+                message, error = pickle.loads(view), None
+            except Exception as e:
+                message, error = None, e
+            finally:
+                if isinstance(view, memoryview):
+                    view.release()
+            # The payload is only valid if the writer did not reach it while we were reading
+            if self._lapped(read_pos):
+                continue
+            expected_seq = seq + 1
+            read_pos += RECORD.size + size
+            if error is not None:
+                logger.error("Dropping message %d that failed to unpickle: %r", seq, error)
+                self.dropped += 1
+                continue
+            try:
+                callback(*message)
+            except Exception:
+                logger.exception("Callback %r failed on message %d", callback, seq)
+
+    def close(self):
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.header = None  # releases its export of the buffer, or close() fails
+        self.shm.close()
+        if self.owner == os.getpid():
+            self.shm.unlink()
+
+
+class UnixSocketTransport:
+    """Fallback over Unix domain datagram sockets, for when shared memory is not available.
+    Every listener binds a socket file in `directory`, and `send` delivers each message
+    to all the socket files found there, blocking while a listener's queue is full.
+    The receiver thread only moves datagrams to an in-process queue and callbacks run on
+    a second thread, so a callback publishing again cannot block on its own full socket.
+    Messages are limited to the datagram size (net.core.wmem_default, ~200KB on Linux).
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or tempfile.mkdtemp(prefix='event_channel-')
+        self.sender = None
+        self.receiver = None
+        self.path = None
+        self.threads = []
+        self.peers, self.peers_at = [], 0
+
+    def __getstate__(self):
+        return {'directory': self.directory}
+
+    def __setstate__(self, state):
+        self.__init__(state['directory'])
+
+    def send(self, event, args_list):
+        if self.sender is None:
+            self.sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        if time.monotonic() - self.peers_at > 1:
+            self.peers = [os.path.join(self.directory, f)
+                          for f in os.listdir(self.directory) if f.endswith('.sock')]
+            self.peers_at = time.monotonic()
+        payload = pickle.dumps((event, args_list), protocol=pickle.HIGHEST_PROTOCOL)
+        for peer in self.peers:
+            try:
+                self.sender.sendto(payload, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                pass  # the listener has gone away
+
+    def listen(self, callback):
+        self.path = os.path.join(self.directory, f'{os.getpid()}-{uuid.uuid4().hex}.sock')
+        self.receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+        self.receiver.bind(self.path)
+        self.peers_at = 0
+        received = queue.SimpleQueue()
+        self.threads = [threading.Thread(target=self._receive, args=(received,), daemon=True),
+                        threading.Thread(target=self._dispatch, args=(received, callback), daemon=True)]
+        for thread in self.threads:
+            thread.start()
+
+    def _receive(self, received):
+        while True:
+            try:
+                payload = self.receiver.recv(1 << 20)
+            except OSError:
+                payload = b''
+            received.put(payload)
+            if not payload:
+                return
+
+    def _dispatch(self, received, callback):
+        while payload := received.get():
+            try:
+                callback(*pickle.loads(payload))
+            except Exception:
+                logger.exception("Callback %r failed", callback)
+
+    def close(self):
+        if self.receiver is not None:
+            # An empty datagram wakes the receiver thread up so it can exit
+            with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as waker:
+                waker.sendto(b'', self.path)
+            for thread in self.threads:
+                thread.join()
+            self.receiver.close()
+            os.remove(self.path)
+        if self.sender is not None:
+            self.sender.close()
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    from statistics import median
+
+    from event_channel import EventChannel
+
+    EVENTS = 50_000
+
+    def subscriber(transport, ready, results):
+        latencies = []
+        done = threading.Event()
+
+        def on_event(sent_at):
+            latencies.append(time.perf_counter() - sent_at)
+            if len(latencies) == EVENTS:
+                done.set()
+
+        channel = EventChannel(transport=transport)
+        channel.subscribe('bench', on_event)
+        ready.set()
+        done.wait()
+        channel.close()
+        results.put(latencies)
+
+    def queue_subscriber(mp_queue, ready, results):
+        ready.set()
+        latencies = []
+        for _ in range(EVENTS):
+            event, sent_at = mp_queue.get()
+            latencies.append(time.perf_counter() - sent_at)
+        results.put(latencies)
+
+    def run(name, target, transport, publish):
+        ready, results = multiprocessing.Event(), multiprocessing.Queue()
+        process = multiprocessing.Process(target=target, args=(transport, ready, results))
+        process.start()
+        ready.wait()
+        start = time.perf_counter()
+        for _ in range(EVENTS):
+            publish(time.perf_counter())
+        latencies = results.get()
+        elapsed = time.perf_counter() - start
+        process.join()
+        print(f"{name:>22}: {EVENTS / elapsed:9.0f} events/s, "
+              f"median latency {median(latencies) * 1e6:8.1f}us")
+
+    shm = SharedMemoryTransport()
+    run('SharedMemoryTransport', subscriber, shm, lambda t: shm.send('bench', [t]))
+    shm.close()
+
+    sock = UnixSocketTransport()
+    run('UnixSocketTransport', subscriber, sock, lambda t: sock.send('bench', [t]))
+    sock.close()
+
+    mp_queue = multiprocessing.Queue()
+    run('multiprocessing.Queue', queue_subscriber, mp_queue, lambda t: mp_queue.put(('bench', t)))
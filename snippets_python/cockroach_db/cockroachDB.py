@@ -1,5 +1,17 @@
+import asyncio
+import csv
+import io
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
 import psycopg2
 from loguru import logger as lo
+from psycopg2 import errorcodes, sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 COCKROACHDB_CONFIG = {
     "sample": {
@@ -9,25 +21,239 @@ COCKROACHDB_CONFIG = {
         "dbname": "sample",
     }
 }
+POOL_CONFIG = {
+    "min_size": 1,
+    "max_size": 10,
+    "health_check_after": 30,  # seconds idle before a connection is pinged on checkout
+}
+RETRY_CONFIG = {
+    "max_retries": 5,
+    "base_delay": 0.05,
+    "max_delay": 2.0,
+}
+
+
+def backoff(attempt):
+    # Exponential backoff with jitter, so that conflicting transactions don't retry in lockstep
+    delay = min(RETRY_CONFIG["max_delay"], RETRY_CONFIG["base_delay"] * 2**attempt)
+    return delay * random.uniform(0.5, 1)
+
+
+def fetch_result(curs):
+    # Rows for statements returning some, otherwise the number of affected rows
+    return curs.fetchall() if curs.description is not None else curs.rowcount
+
+
+def csv_buffer(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    return buffer
+
 
+class CockroachDB:
+    """psycopg2 flavour. Blocking methods are safe to call from many threads, and the
+    `*_async` methods run them on a thread pool no larger than the connection pool, so an
+    event loop never waits on the database.
+    Unlike psycopg2's ThreadedConnectionPool, which raises when exhausted, checkout blocks
+    until a connection is returned. Closed connections are replaced, and connections idle
+    for longer than `health_check_after` are pinged before being handed out.
+    """
 
-async def execute_query(db_name, query):
-    try:
-        conn = psycopg2.connect(**COCKROACHDB_CONFIG[db_name])
-    except Exception:
-        lo.error("database connection failed")
-        raise
-    try:
-        with conn:
+    def __init__(self, db_name):
+        try:
+            self.pool = ThreadedConnectionPool(POOL_CONFIG["min_size"], POOL_CONFIG["max_size"],
+                                               **COCKROACHDB_CONFIG[db_name])
+        except Exception:
+            lo.error("database connection failed")
+            raise
+        self.slots = threading.BoundedSemaphore(POOL_CONFIG["max_size"])
+        self.last_used = {}
+        self.executor = ThreadPoolExecutor(POOL_CONFIG["max_size"], thread_name_prefix=f"cockroachdb-{db_name}")
+
+    def _healthy(self, conn):
+        if conn.closed:
+            return False
+        last_used = self.last_used.get(id(conn))  # None for a new connection
+        if last_used is None or time.monotonic() - last_used < POOL_CONFIG["health_check_after"]:
+            return True
+        try:
             with conn.cursor() as curs:
-                curs.execute(query)
-    except Exception:
-        lo.error("database query failed")
-        raise
-    finally:
-        conn.close()
+                curs.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    @contextmanager
+    def connection(self):
+        self.slots.acquire()
+        try:
+            conn = self.pool.getconn()
+            while not self._healthy(conn):
+                lo.warning("dropping broken database connection")
+                self.last_used.pop(id(conn), None)
+                self.pool.putconn(conn, close=True)
+                conn = self.pool.getconn()
+            try:
+                yield conn
+            finally:
+                try:
+                    conn.rollback()  # no-op after a commit
+                    self.last_used[id(conn)] = time.monotonic()
+                except psycopg2.Error:
+                    conn.close()
+                    self.last_used.pop(id(conn), None)
+                self.pool.putconn(conn, close=bool(conn.closed))
+        finally:
+            self.slots.release()
+
+    def run_transaction(self, fn):
+        # Runs fn(cursor) in a transaction and returns its result. The whole transaction is
+        # retried with backoff on serialization failures (40001), which CockroachDB raises
+        # under contention and expects clients to retry.
+        for attempt in range(RETRY_CONFIG["max_retries"] + 1):
+            with self.connection() as conn:
+                try:
+                    with conn.cursor() as curs:
+                        result = fn(curs)
+                    conn.commit()
+                    return result
+                except psycopg2.Error as e:
+                    if e.pgcode != errorcodes.SERIALIZATION_FAILURE or attempt == RETRY_CONFIG["max_retries"]:
+                        lo.error("database query failed")
+                        raise
+                    lo.warning(f"serialization failure, retrying ({attempt + 1})")
+            time.sleep(backoff(attempt))
+
+    def query(self, query, params=None):
+        def fn(curs):
+            curs.execute(query, params)
+            return fetch_result(curs)
+        return self.run_transaction(fn)
+
+    def execute_many(self, query, rows, page_size=1000):
+        # query has a single VALUES placeholder, e.g. "INSERT INTO t (a, b) VALUES %s", which is
+        # expanded to page_size rows per statement instead of one round trip per row
+        rows = list(rows)
+
+        def fn(curs):
+            count = 0
+            for i in range(0, len(rows), page_size):
+                execute_values(curs, query, rows[i:i+page_size], page_size=page_size)
+                count += curs.rowcount
+            return count
+        return self.run_transaction(fn)
+
+    def copy_rows(self, table, columns, rows):
+        # Bulk insert streamed as CSV through COPY FROM STDIN. Returns the number of rows copied.
+        rows = list(rows)
+        statement = sql.SQL("COPY {} ({}) FROM STDIN WITH CSV").format(
+            sql.Identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns)))
+
+        def fn(curs):
+            curs.copy_expert(statement, csv_buffer(rows))
+            return curs.rowcount
+        return self.run_transaction(fn)
+
+    async def _run_async(self, method, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, method, *args)
+
+    async def query_async(self, query, params=None):
+        return await self._run_async(self.query, query, params)
+
+    async def execute_many_async(self, query, rows, page_size=1000):
+        return await self._run_async(self.execute_many, query, rows, page_size)
+
+    async def copy_rows_async(self, table, columns, rows):
+        return await self._run_async(self.copy_rows, table, columns, rows)
+
+    def close(self):
+        self.executor.shutdown()
+        self.pool.closeall()
+
+
+class AsyncCockroachDB:
+    """asyncpg flavour, natively async. Create it with `await AsyncCockroachDB.create(db_name)`
+    inside the event loop it will be used from. Placeholders are $1, $2, ... instead of %s.
+    asyncpg reconnects closed connections on acquire, and closes connections idle for
+    longer than `health_check_after`.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+
+    @classmethod
+    async def create(cls, db_name):
+        import asyncpg  # optional, only needed by the async flavour
+
+        config = dict(COCKROACHDB_CONFIG[db_name])
+        config["database"] = config.pop("dbname")
+        try:
+            pool = await asyncpg.create_pool(
+                min_size=POOL_CONFIG["min_size"], max_size=POOL_CONFIG["max_size"],
+                max_inactive_connection_lifetime=POOL_CONFIG["health_check_after"], **config)
+        except Exception:
+            lo.error("database connection failed")
+            raise
+        return cls(pool)
+
+    async def run_transaction(self, fn):
+        # Same as CockroachDB.run_transaction, with fn an async function of the connection
+        for attempt in range(RETRY_CONFIG["max_retries"] + 1):
+            async with self.pool.acquire() as conn:
+                try:
+                    async with conn.transaction():
+                        return await fn(conn)
+                except Exception as e:
+                    # asyncpg errors carry the SQLSTATE, like pgcode for psycopg2
+                    sqlstate = getattr(e, "sqlstate", None)
+                    if sqlstate != errorcodes.SERIALIZATION_FAILURE or attempt == RETRY_CONFIG["max_retries"]:
+                        lo.error("database query failed")
+                        raise
+                    lo.warning(f"serialization failure, retrying ({attempt + 1})")
+            await asyncio.sleep(backoff(attempt))
+
+    async def query(self, query, *params):
+        async def fn(conn):
+            return await conn.fetch(query, *params)
+        return await self.run_transaction(fn)
+
+    async def execute_many(self, query, rows):
+        # asyncpg pipelines the statement for every row instead of a round trip per row
+        async def fn(conn):
+            await conn.executemany(query, rows)
+        await self.run_transaction(fn)
+
+    async def copy_rows(self, table, columns, rows):
+        # Bulk insert streamed as CSV through COPY FROM STDIN. Returns the number of rows copied.
+        source = csv_buffer(rows).getvalue().encode()
+
+        async def fn(conn):
+            status = await conn.copy_to_table(table, source=io.BytesIO(source), columns=columns, format="csv")
+            return int(status.split()[-1])
+        return await self.run_transaction(fn)
+
+    async def close(self):
+        await self.pool.close()
+
+
+_databases = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_name):
+    # One shared CockroachDB pool per database
+    with _databases_lock:
+        if db_name not in _databases:
+            _databases[db_name] = CockroachDB(db_name)
+        return _databases[db_name]
+
+
+async def execute_query(db_name, query, params=None):
+    return await get_database(db_name).query_async(query, params)
 
 
 def get_db_info(db_name):
     db = COCKROACHDB_CONFIG[db_name]
-    return f"{db['host']}:{db['port']}/{db['dbname']}"
\ No newline at end of file
+    return f"{db['host']}:{db['port']}/{db['dbname']}"
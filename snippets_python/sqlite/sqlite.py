@@ -1,18 +1,25 @@
+import itertools
+import queue
 import sqlite3
-from dataclasses import dataclass
+import threading
+import weakref
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
 
 from loguru import logger as lo
 
-SQLITE_CONFIG = {
-    "SAMPLE": {
-        "path": "./sample.sqlite",
-        "tables": ["sample1",]
-    }
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",  # readers don't block the writer and vice versa
+    "synchronous": "NORMAL",  # fsync on checkpoints only, still safe from corruption in WAL mode
+    "temp_store": "MEMORY",
+    "cache_size": -64_000,  # KiB
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 5_000,  # ms to wait for another connection's write lock
 }
 
 SAMPLE_SCHEMA = {
     "sample1":
-    """ 
+    """
     CREATE TABLE IF NOT EXISTS sample1 (
         id INTEGER PRIMARY KEY AUTOINCREMENT,
         title TEXT NOT NULL,
@@ -23,29 +30,162 @@ SAMPLE_SCHEMA = {
     """,
 }
 
+SQLITE_CONFIG = {
+    "SAMPLE": {
+        "path": "./sample.sqlite",
+        "tables": ["sample1",],
+        "schema": SAMPLE_SCHEMA,
+    }
+}
+
+
+class Connection(sqlite3.Connection):
+    # sqlite3.Connection itself can't be weakly referenced
+    pass
+
 
 @dataclass
 class Sqlite:
+    """Every thread keeps one long-lived connection, in autocommit mode unless inside
+    `transaction()`. Bulk writes go through `executemany`, or through `write`, which
+    queues them for a background thread that commits everything queued so far at once.
+    Queued writes are visible to readers after `flush()`.
+    Only the thread-local holds a connection, so it is closed when its thread exits.
+    """
     name: str
+    batch_size: int = 10_000  # max queued writes committed together
+    local: threading.local = field(default_factory=threading.local, init=False, repr=False)
+    connections: weakref.WeakSet = field(default_factory=weakref.WeakSet, init=False, repr=False)
+    queries: weakref.WeakSet = field(default_factory=weakref.WeakSet, init=False, repr=False)
+    lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    writes: queue.Queue = field(default_factory=queue.Queue, init=False, repr=False)
+    writer: threading.Thread = field(default=None, init=False, repr=False)
+
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(SQLITE_CONFIG[self.name]["path"], isolation_level=None,
+                                   check_same_thread=False, factory=Connection)
+            conn.row_factory = sqlite3.Row
+            for pragma, value in SQLITE_PRAGMAS.items():
+                conn.execute(f"PRAGMA {pragma}={value}")
+            self.local.conn = conn
+            with self.lock:
+                self.connections.add(conn)
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
 
     def execute(self, sql_query, values=()):
         try:
-            conn = sqlite3.connect(SQLITE_CONFIG[self.name]["path"])
+            conn = self.connection()
         except Exception as e:
             lo.error(f"Sqlite {self.name} connection failed with error: {e}")
             return
         try:
-            conn.row_factory = sqlite3.Row
-            cur = conn.cursor()
-            results = cur.execute(sql_query, values).fetchall()
-            conn.commit()
-            return results
+            return conn.execute(sql_query, values).fetchall()
         except Exception as e:
             lo.error(f"Sqlite {self.name} operation failed with error: {e}")
+
+    def executemany(self, sql_query, rows):
+        # All rows in a single transaction, returns the number of rows changed
+        try:
+            with self.transaction() as conn:
+                return conn.executemany(sql_query, rows).rowcount
+        except Exception as e:
+            lo.error(f"Sqlite {self.name} operation failed with error: {e}")
+
+    def iter_query(self, sql_query, values=(), size=1000):
+        # Streams the rows, holding at most `size` of them in memory at a time
+        rows = self._iter_query(sql_query, values, size)
+        with self.lock:
+            self.queries.add(rows)
+        return rows
+
+    def _iter_query(self, sql_query, values, size):
+        try:
+            cur = self.connection().execute(sql_query, values)
+        except Exception as e:
+            lo.error(f"Sqlite {self.name} operation failed with error: {e}")
+            return
+        try:
+            while rows := cur.fetchmany(size):
+                yield from rows
         finally:
-            conn.close()
+            cur.close()
+
+    def write(self, sql_query, values=()):
+        if self.writer is None:
+            with self.lock:
+                if self.writer is None:
+                    self.writer = threading.Thread(target=self._write_loop, daemon=True)
+                    self.writer.start()
+        self.writes.put((sql_query, values))
+
+    def flush(self):
+        # Waits until every queued write is committed
+        self.writes.join()
+
+    def _write_loop(self):
+        while True:
+            # Everything queued while the previous batch was committing goes in the next one
+            batch = [self.writes.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.writes.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch([item for item in batch if item is not None])
+            for _ in batch:
+                self.writes.task_done()
+            if None in batch:
+                return
+
+    def _write_batch(self, batch):
+        try:
+            with self.transaction() as conn:
+                # Consecutive writes of the same statement become one executemany
+                for sql_query, items in itertools.groupby(batch, key=lambda item: item[0]):
+                    conn.executemany(sql_query, [values for _, values in items])
+            return
+        except Exception as e:
+            lo.error(f"Sqlite {self.name} batch write failed with error: {e}, retrying one by one")
+        for sql_query, values in batch:
+            try:
+                with self.transaction() as conn:
+                    conn.execute(sql_query, values)
+            except Exception as e:
+                lo.error(f"Sqlite {self.name} operation failed with error: {e}")
+
+    def close(self):
+        if self.writer is not None:
+            self.writes.put(None)
+            self.writer.join()
+            self.writer = None
+        with self.lock:
+            # Unfinished iter_query generators close their cursor while the connection is open
+            for rows in list(self.queries):
+                with suppress(ValueError):  # running in another thread
+                    rows.close()
+            for conn in list(self.connections):
+                conn.close()
+            self.queries.clear()
+            self.connections.clear()
+        self.local = threading.local()
 
     def create_tables(self):
         for table_name in SQLITE_CONFIG[self.name]["tables"]:
-            self.execute(TABLES_SCHEMA[table_name])
-        lo.debug(f"Sqlite {self.name} tables created")
\ No newline at end of file
+            self.execute(SQLITE_CONFIG[self.name]["schema"][table_name])
+        lo.debug(f"Sqlite {self.name} tables created")
@@ -0,0 +1,85 @@
+# Inserts/second and point query latency of the Sqlite class against the previous
+# behaviour of a new connection, fetchall() and commit per statement.
+
+import os
+import sqlite3
+import tempfile
+from dataclasses import dataclass
+from statistics import median
+from time import perf_counter
+
+from loguru import logger as lo
+
+from sqlite import SQLITE_CONFIG, Sqlite
+
+ROWS = 20_000
+SLOW_ROWS = 1_000  # the per-statement connection is too slow for ROWS
+QUERIES = 2_000
+INSERT = "INSERT INTO sample1 (title, type) VALUES (?, ?)"
+
+
+@dataclass
+class OneShotSqlite(Sqlite):
+    def execute(self, sql_query, values=()):
+        conn = sqlite3.connect(SQLITE_CONFIG[self.name]["path"])
+        try:
+            conn.row_factory = sqlite3.Row
+            results = conn.cursor().execute(sql_query, values).fetchall()
+            conn.commit()
+            return results
+        finally:
+            conn.close()
+
+
+def fresh_db(directory, name):
+    SQLITE_CONFIG[name] = dict(SQLITE_CONFIG["SAMPLE"], path=os.path.join(directory, f"{name}.sqlite"))
+    return name
+
+
+def report_inserts(name, rows, start):
+    print(f"{name:>32}: {rows / (perf_counter() - start):10.0f} inserts/s")
+
+
+def report_queries(name, db):
+    latencies = []
+    for i in range(QUERIES):
+        start = perf_counter()
+        db.execute("SELECT * FROM sample1 WHERE id = ?", (i % SLOW_ROWS + 1,))
+        latencies.append(perf_counter() - start)
+    print(f"{name:>32}: {median(latencies) * 1e6:10.1f}us median point query")
+
+
+if __name__ == "__main__":
+    lo.remove()
+    with tempfile.TemporaryDirectory() as directory:
+        old = OneShotSqlite(fresh_db(directory, "old"))
+        old.create_tables()
+        start = perf_counter()
+        for i in range(SLOW_ROWS):
+            old.execute(INSERT, (f"title {i}", "old"))
+        report_inserts("new connection per statement", SLOW_ROWS, start)
+
+        db = Sqlite(fresh_db(directory, "new"))
+        db.create_tables()
+        start = perf_counter()
+        for i in range(ROWS):
+            db.execute(INSERT, (f"title {i}", "execute"))
+        report_inserts("persistent connection, WAL", ROWS, start)
+
+        start = perf_counter()
+        db.executemany(INSERT, ((f"title {i}", "executemany") for i in range(ROWS)))
+        report_inserts("executemany", ROWS, start)
+
+        start = perf_counter()
+        for i in range(ROWS):
+            db.write(INSERT, (f"title {i}", "write"))
+        db.flush()
+        report_inserts("write queue", ROWS, start)
+
+        report_queries("new connection per statement", old)
+        report_queries("persistent connection", db)
+
+        start = perf_counter()
+        count = sum(1 for _ in db.iter_query("SELECT * FROM sample1"))
+        print(f"{'iter_query full scan':>32}: {count / (perf_counter() - start):10.0f} rows/s")
+        db.close()